@@ -1,20 +1,36 @@
 import asyncio
-import random
+import logging
 
 from collections import deque, defaultdict
-from math import sqrt
-from typing import Tuple, List, Dict, Optional
+from typing import Tuple, List, Dict, Optional, Set
 
-import spade
 from spade.agent import Agent
 from spade.behaviour import CyclicBehaviour, OneShotBehaviour
 from spade.message import Message
 from spade.template import Template
 
+from agents.bids import Bid
+from agents.messages import encode, decode, make_message
 from agents.visualizator import VisualizationBehaviour, VisualizationMixin
 
 from settings import *
 
+logger = logging.getLogger(__name__)
+
+# Rover replies to the base's CFPs (propose/refuse/...) all carry this type.
+# Built once and shared: bids go to the active negotiation, everything else
+# to ReceiveMessages, so neither behaviour queues the other's traffic.
+_ROVER_BID_TEMPLATE = Template(metadata={"type": "rover_bid_cfp"})
+_BASE_INBOX_TEMPLATE = ~_ROVER_BID_TEMPLATE
+
+# Metadata shared by every message of a kind; copied into each message, never mutated
+_ROVER_CFP_META = {"performative": "cfp", "type": "rover_bid_cfp"}
+_ROVER_ACCEPT_META = {"performative": "accept_proposal", "type": "rover_bid_cfp"}
+_ROVER_REJECT_META = {"performative": "reject_proposal", "type": "rover_bid_cfp"}
+_DRONE_PROPOSE_META = {"performative": "propose", "type": "rover_bid_cfp"}
+_DRONE_REFUSE_META = {"performative": "refuse", "type": "drone_bid_cfp"}
+_DRONE_INFORM_META = {"performative": "inform", "type": "drone_bid_cfp"}
+
 class Base(VisualizationMixin, Agent):
     """
     Base station agent that coordinates rovers and drones for exploration missions.
@@ -25,11 +41,11 @@ class Base(VisualizationMixin, Agent):
     Attributes:
         position (Tuple[float, float]): The (x, y) coordinates of the base station.
         radius (int): Communication radius of the base station.
-        rovers (List[str]): List of rover JIDs currently at the base.
+        rovers (Set[str]): JIDs of the rovers currently standing by at the base.
         drones (List[str]): List of drone JIDs known to the base.
         resources (Dict): Dictionary tracking detected resources with counts and positions.
-        pending_missions (List): Queue of locations awaiting exploration.
-        proposals (Dict): Temporary storage for rover bids during contract negotiation.
+        pending_missions (deque): FIFO queue of locations awaiting exploration.
+        proposals (Dict[str, Bid]): Temporary storage for rover bids during contract negotiation.
         viz_server: Visualization server connection for displaying base status.
     """
     
@@ -59,12 +75,12 @@ class Base(VisualizationMixin, Agent):
         self.position = tuple(position)
         self.radius = radius
 
-        self.rovers = rover_jids
+        self.rovers: Set[str] = set(rover_jids)
         self.drones = drone_jids
 
         self.resources = defaultdict(lambda: { "count": 0, "positions": [] })
-        self.pending_missions = []
-        self.proposals = {}
+        self.pending_missions = deque()
+        self.proposals: Dict[str, Bid] = {}
 
         self.viz_server = viz_server
         if self.viz_server:
@@ -111,22 +127,35 @@ class Base(VisualizationMixin, Agent):
             """
             base = self.agent
 
-            for rover_jid in base.rovers:
-                msg = Message(to=rover_jid)
-                msg.set_metadata("performative", "cfp")
-                msg.set_metadata("type", "rover_bid_cfp")
-                msg.body = str(self.target_position)
-                await self.send(msg)
-                print(f"{MAGENTA}[{base.name}] CFP sent to {rover_jid} for mission at {self.target_position}{RESET}")
+            if not base.rovers:
+                # Roster drained between the drone CFP and this negotiation starting
+                await self.on_all_responses_received()
+                return
+
+            body = encode(self.target_position)
+            # Build every CFP before the first send so roster changes made while
+            # this behaviour is suspended cannot disturb the iteration
+            cfps = [make_message(rover_jid, _ROVER_CFP_META, body) for rover_jid in base.rovers]
+            await asyncio.gather(*(self.send(msg) for msg in cfps))
+            for msg in cfps:
+                logger.debug("[%s] CFP sent to %s for mission at %s", base.name, msg.to, self.target_position)
+
+            awaiting = {str(msg.to) for msg in cfps}
 
             timeout = 1
 
-            start_time = asyncio.get_event_loop().time()
+            loop = asyncio.get_event_loop()
+            deadline = loop.time() + timeout
 
-            while asyncio.get_event_loop().time() - start_time < timeout:
-                msg = await self.receive(timeout=1)
+            # Wake only when a reply arrives and stop as soon as every rover has answered
+            while awaiting:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                msg = await self.receive(timeout=remaining)
 
                 if msg:
+                    awaiting.discard(str(msg.sender))
                     perf = msg.metadata.get("performative")
                     if perf == "propose":
                         await self.on_propose(msg)
@@ -146,7 +175,7 @@ class Base(VisualizationMixin, Agent):
             Args:
                 message (Message): The failure message from a rover.
             """
-            print(f"{MAGENTA}[{self.agent.name}] Rover {str(message.sender).split('@')[0]} failed during the contract net protocol.{RESET}")
+            logger.warning("[%s] Rover %s failed during the contract net protocol.", self.agent.name, str(message.sender).split('@')[0])
 
         def on_not_understood(self, message: Message):
             """
@@ -155,7 +184,7 @@ class Base(VisualizationMixin, Agent):
             Args:
                 message (Message): The not-understood message from a rover.
             """
-            print(f"{MAGENTA}[{self.agent.name}] Rover {str(message.sender).split('@')[0]} did not understand the CFP.{RESET}")
+            logger.warning("[%s] Rover %s did not understand the CFP.", self.agent.name, str(message.sender).split('@')[0])
 
         def on_refuse(self, message: Message):
             """
@@ -164,7 +193,7 @@ class Base(VisualizationMixin, Agent):
             Args:
                 message (Message): The refusal message containing the reason.
             """
-            print(f"{MAGENTA}[{self.agent.name}] Rover {str(message.sender).split('@')[0]} refused to bid for mission at {self.target_position}: reason - {eval(message.body)}{RESET}")
+            logger.info("[%s] Rover %s refused to bid for mission at %s: reason - %s", self.agent.name, str(message.sender).split('@')[0], self.target_position, message.body)
 
         async def on_propose(self, message: Message):
             """
@@ -176,23 +205,19 @@ class Base(VisualizationMixin, Agent):
             Args:
                 message (Message): The proposal message containing bid details.
             """
+            base = self.agent
             try:
-                base = self.agent
+                bid = Bid.decode(message.body)
+            except KeyError:
+                logger.warning("[%s] Ignoring invalid proposal from %s: No 'rover id' specified.", base.name, message.sender)
+                return
+            except (AttributeError, TypeError, ValueError):
+                logger.warning("[%s] Invalid proposal format from %s. Body: %s", base.name, message.sender, message.body)
+                return
 
-                bid_data = eval(message.body)
-                cost = float(bid_data.get("cost", float('inf')))
-                rover_jid = bid_data.get("rover")
-                
-                print(f"{MAGENTA}[{base.name}] Received PROPOSAL from {message.sender}: Cost={cost}, Rover={rover_jid}{RESET}")
-                await base.viz_send_message(f"Received proposal from {str(message.sender).split('@')[0]}: Cost={cost}")
-                
-                if rover_jid is not None:
-                    base.proposals[str(message.sender)] = {"cost": cost, "rover": rover_jid, "proposal_msg": message}
-                else:
-                    print(f"{MAGENTA}[{base.name}] Ignoring invalid proposal from {message.sender}: No 'rover id' specified.{RESET}")
-            
-            except (SyntaxError, TypeError, ValueError):
-                print(f"{MAGENTA}[{base.name}] Invalid proposal format from {message.sender}. Body: {message.body}{RESET}")
+            logger.info("[%s] Received PROPOSAL from %s: Cost=%s, Rover=%s", base.name, message.sender, bid.cost, bid.rover)
+            await base.viz_send_message(f"Received proposal from {str(message.sender).split('@')[0]}: Cost={bid.cost}")
+            base.proposals[str(message.sender)] = bid
 
         async def on_all_responses_received(self):
             """
@@ -202,32 +227,24 @@ class Base(VisualizationMixin, Agent):
             to the drone, notifies the winning rover, and rejects other proposals.
             """
             base = self.agent
-            print(f"{MAGENTA}[{base.name}] All responses received for mission at {self.target_position}.{RESET}")
+            logger.debug("[%s] All responses received for mission at %s.", base.name, self.target_position)
 
             if not base.proposals:
-                print(f"{MAGENTA}[{base.name}] No proposals received for mission at {self.target_position}{RESET}")
+                logger.info("[%s] No proposals received for mission at %s", base.name, self.target_position)
                 await base.viz_send_message(f"No proposals received for mission at {self.target_position}")
                 return
 
-            best_sender, best_data = min(base.proposals.items(), key=lambda x: x[1]["cost"])
-            best_bid = best_data
+            best_sender, best_bid = min(base.proposals.items(), key=lambda x: x[1].cost)
             
-            accept_msg = Message(to=self.drone)
-            accept_msg.set_metadata("performative", "propose")
-            accept_msg.set_metadata("type", "rover_bid_cfp")
-            accept_msg.body = str({"target": self.target_position, "base": str(base.jid), "rover": str(best_sender), "cost": best_bid['cost']})
-            print(f"{MAGENTA}[{base.name}] Sending winner bid to drone 'target': {self.target_position}, 'base': {base.jid}, 'rover': {best_sender}, 'cost': {best_bid['cost']}{RESET}")
-            await base.viz_send_message(f"Selected {str(best_sender).split('@')[0]} for mission at {self.target_position} (cost: {best_bid['cost']:.1f})")
+            accept_msg = make_message(str(self.drone), _DRONE_PROPOSE_META, encode({"target": self.target_position, "base": str(base.jid), "rover": str(best_sender), "cost": best_bid.cost}))
+            logger.info("[%s] Sending winner bid to drone 'target': %s, 'base': %s, 'rover': %s, 'cost': %s", base.name, self.target_position, base.jid, best_sender, best_bid.cost)
+            await base.viz_send_message(f"Selected {str(best_sender).split('@')[0]} for mission at {self.target_position} (cost: {best_bid.cost:.1f})")
             await self.send(accept_msg)
 
-            for sender, data in base.proposals.items():
+            for sender in base.proposals:
                 if sender != best_sender:
-                    reject_msg = Message(to=sender)
-                    reject_msg.set_metadata("performative", "reject_proposal")
-                    reject_msg.set_metadata("type", "rover_bid_cfp")
-                    reject_msg.body = str({"target": self.target_position})
-                    await self.send(reject_msg)
-            base.proposals = {}
+                    await self.send(make_message(sender, _ROVER_REJECT_META, encode({"target": self.target_position})))
+            base.proposals.clear()
 
         async def on_inform(self, message: Message):
             """
@@ -236,7 +253,7 @@ class Base(VisualizationMixin, Agent):
             Args:
                 message (Message): The inform message from a rover.
             """
-            print(f"{MAGENTA}[{self.agent.name}] Received INFORM from {message.sender} about mission completion.{RESET}")
+            logger.info("[%s] Received INFORM from %s about mission completion.", self.agent.name, message.sender)
 
     class ReceiveMessages(CyclicBehaviour):
         """
@@ -246,103 +263,161 @@ class Base(VisualizationMixin, Agent):
         rover status updates, and resource discoveries.
         """
         
+        async def on_start(self):
+            """
+            Map (performative, type) pairs to their handlers.
+            """
+            self.handlers = {
+                ("cfp", "rover_mission_cfp"): self.on_mission_cfp,
+                ("accept_proposal", "rover_bid_accepted"): self.on_bid_accepted,
+                ("reject_proposal", "rover_bid_rejected"): self.on_bid_rejected,
+                ("inform", "rover_leaving_base"): self.on_rover_leaving,
+                ("inform", "mission_complete"): self.on_mission_complete,
+                ("inform", "resources_found"): self.on_resources_found,
+                ("inform", "rover_returned_to_base"): self.on_rover_returned,
+            }
+
         async def run(self):
             """
             Process incoming messages and dispatch them to appropriate handlers.
             
-            Monitors for mission CFPs, bid results, rover departures/returns,
-            and resource discovery notifications.
+            Reads the message metadata and sender once, then looks the
+            handler up by (performative, type) in a single dict access.
             """
-            base = self.agent
             msg = await self.receive(timeout=3)
+            if not msg:
+                return
 
-            if msg:
-                sender = str(msg.sender).split("@")[0]
-                msg_type = msg.metadata.get("type")
-                performative = msg.metadata.get("performative")
-                print(f"{MAGENTA}[{base.name}] Message received from {sender} (type: {msg_type}, performative: {performative}){RESET}")
-
-                if performative == "cfp" and msg_type == "rover_mission_cfp":
-                    if not base.rovers:
-                        drone_msg = Message(to=msg.sender)
-                        drone_msg.set_metadata("performative", "refuse")
-                        drone_msg.set_metadata("type", "drone_bid_cfp")
-                        drone_msg.body = str({"reason": "no_rovers_available"})
-                        print(f"{MAGENTA}[{base.name}] Sending reject bid to drone, no rovers available{RESET}")
-                        await base.viz_send_message(f"Rejected mission request from {sender}: No rovers available")
-                        await self.send(drone_msg)
-
-                    else:
-                        target_pos = eval(msg.body)
-                        print(f"{MAGENTA}[{base.name}] Received mission CFP from {sender} for target {target_pos}{RESET}")
-                        await base.viz_send_message(f"Received mission request from {sender} for target {target_pos}")
-                        base.add_behaviour(base.RequestRoverForBid(target_pos, msg.sender))
-
-                if performative == "accept_proposal" and msg_type == "rover_bid_accepted":
-                    target_data = eval(msg.body)
-                    target_pos = target_data.get("target")
-                    winning_rover = target_data.get("rover")
-
-                    print(f"{MAGENTA}[{base.name}] Bid accepted from {sender} for target {target_pos}{RESET}")
-                    await base.viz_send_message(f"Mission confirmed: Sending {str(winning_rover).split('@')[0]} to {target_pos}")
-                    
-                    accept_msg = Message(to=winning_rover)
-                    accept_msg.set_metadata("performative", "accept_proposal")
-                    accept_msg.set_metadata("type", "rover_bid_cfp")
-                    accept_msg.body = str({"target": target_pos})
-                    await self.send(accept_msg)
-                
-                if performative == "reject_proposal" and msg_type == "rover_bid_rejected":
-                    target_data = eval(msg.body)
-                    target_pos = target_data.get("target")
-                    rejected_rover = target_data.get("rover")
-                    print(f"{MAGENTA}[{base.name}] Bid rejected CFP from {sender} for target {target_pos}{RESET}")
-
-                    reject_msg = Message(to=rejected_rover)
-                    reject_msg.set_metadata("performative", "reject_proposal")
-                    reject_msg.set_metadata("type", "rover_bid_cfp")
-                    await self.send(reject_msg)
-
-                if performative == "inform" and msg_type == "rover_leaving_base":
-                    rover = msg.sender
-                    print(f"{MAGENTA}[{base.name}] Rover {str(rover).split('@')[0]} leaving base{RESET}")
-                    await base.viz_send_message(f"Rover {str(rover).split('@')[0]} departing from base")
-                    base.rovers.remove(rover)
-                    
-                if performative == "inform" and msg_type == "mission_complete":
-                    rover = msg.sender
-                    target_data = eval(msg.body)
-                    position = target_data.get("position")
-                    print(f"{MAGENTA}[{base.name}] Rover {str(rover).split('@')[0]} arrived at goal: current position {position}{RESET}")
-                    await base.viz_send_message(f"Rover {str(rover).split('@')[0]} reached target at {position}")
-                    await base.viz_mark_explored(position[0], position[1])
-
-                if performative == "inform" and msg_type == "resources_found":
-                    rover = msg.sender
-                    target_data = eval(msg.body)
-                    position = target_data.get("position")
-                    resources = target_data.get("resources")
-                    print(f"{MAGENTA}[{base.name}] Rover {str(rover).split('@')[0]} found resources at goal: current position {position}, resources: {resources}{RESET}")
-                    await base.viz_send_message(f"Rover {str(rover).split('@')[0]} discovered {len(resources)} resources at {position}")
-
-                    for resource in resources:
-                        base.resources[resource]["count"] += 1
-                        base.resources[resource]["positions"].append(position)
-                        await base.viz_report_resource(resource, position[0], position[1])
-
-                if performative == "inform" and msg_type == "rover_returned_to_base":
-                    rover = msg.sender
-                    print(f"{MAGENTA}[{base.name}] Rover {str(rover).split('@')[0]} returned to base{RESET}")
-                    await base.viz_send_message(f"Rover {str(rover).split('@')[0]} returned to base")
-                    base.rovers.append(rover)
-
-                    for drone in base.drones:
-                        has_rovers_msg = Message(to=drone)
-                        has_rovers_msg.set_metadata("performative", "inform")
-                        has_rovers_msg.set_metadata("type", "drone_bid_cfp")
-                        has_rovers_msg.body = str({"inform": "has_rovers_available"})
-                        print(f"{MAGENTA}[{base.name}] Sending inform bid to {drone}, rovers available{RESET}")
-                        await self.send(has_rovers_msg)
+            metadata = msg.metadata
+            performative = metadata.get("performative")
+            msg_type = metadata.get("type")
+            sender = str(msg.sender).split("@")[0]
+            logger.debug("[%s] Message received from %s (type: %s, performative: %s)", self.agent.name, sender, msg_type, performative)
+
+            handler = self.handlers.get((performative, msg_type))
+            if handler is not None:
+                await handler(msg, sender)
+
+        async def on_mission_cfp(self, msg: Message, sender: str):
+            """
+            Answer a drone's mission CFP, refusing it when no rover is docked.
+
+            Args:
+                msg (Message): CFP message from a drone.
+                sender (str): Short name of the drone.
+            """
+            base = self.agent
+            if not base.rovers:
+                drone_msg = make_message(str(msg.sender), _DRONE_REFUSE_META, encode({"reason": "no_rovers_available"}))
+                logger.info("[%s] Sending reject bid to drone, no rovers available", base.name)
+                await base.viz_send_message(f"Rejected mission request from {sender}: No rovers available")
+                await self.send(drone_msg)
+                return
+
+            target_pos = tuple(decode(msg.body))
+            logger.info("[%s] Received mission CFP from %s for target %s", base.name, sender, target_pos)
+            await base.viz_send_message(f"Received mission request from {sender} for target {target_pos}")
+            base.add_behaviour(base.RequestRoverForBid(target_pos, msg.sender), _ROVER_BID_TEMPLATE)
+
+        async def on_bid_accepted(self, msg: Message, sender: str):
+            """
+            Forward a drone's acceptance to the winning rover.
+
+            Args:
+                msg (Message): Accept message from a drone.
+                sender (str): Short name of the drone.
+            """
+            base = self.agent
+            target_data = decode(msg.body)
+            target_pos = tuple(target_data["target"])
+            winning_rover = target_data.get("rover")
+
+            logger.info("[%s] Bid accepted from %s for target %s", base.name, sender, target_pos)
+            await base.viz_send_message(f"Mission confirmed: Sending {str(winning_rover).split('@')[0]} to {target_pos}")
+            
+            await self.send(make_message(winning_rover, _ROVER_ACCEPT_META, encode({"target": target_pos})))
+
+        async def on_bid_rejected(self, msg: Message, sender: str):
+            """
+            Forward a drone's rejection to the losing rover.
+
+            Args:
+                msg (Message): Reject message from a drone.
+                sender (str): Short name of the drone.
+            """
+            base = self.agent
+            target_data = decode(msg.body)
+            target_pos = tuple(target_data["target"])
+            rejected_rover = target_data.get("rover")
+            logger.info("[%s] Bid rejected CFP from %s for target %s", base.name, sender, target_pos)
+
+            await self.send(make_message(rejected_rover, _ROVER_REJECT_META, encode({"target": target_pos})))
+
+        async def on_rover_leaving(self, msg: Message, sender: str):
+            """
+            Stop offering a departing rover for new missions.
+
+            Args:
+                msg (Message): Inform message from a rover.
+                sender (str): Short name of the rover.
+            """
+            base = self.agent
+            logger.info("[%s] Rover %s leaving base", base.name, sender)
+            await base.viz_send_message(f"Rover {sender} departing from base")
+            base.rovers.discard(str(msg.sender))
+
+        async def on_mission_complete(self, msg: Message, sender: str):
+            """
+            Record a rover's arrival at its mission target.
+
+            Args:
+                msg (Message): Inform message from a rover.
+                sender (str): Short name of the rover.
+            """
+            base = self.agent
+            position = tuple(decode(msg.body)["position"])
+            logger.info("[%s] Rover %s arrived at goal: current position %s", base.name, sender, position)
+            await base.viz_send_message(f"Rover {sender} reached target at {position}")
+            await base.viz_mark_explored(position[0], position[1])
+
+        async def on_resources_found(self, msg: Message, sender: str):
+            """
+            Tally the resources a rover discovered.
+
+            Args:
+                msg (Message): Inform message from a rover.
+                sender (str): Short name of the rover.
+            """
+            base = self.agent
+            target_data = decode(msg.body)
+            position = tuple(target_data["position"])
+            resources = target_data.get("resources")
+            logger.info("[%s] Rover %s found resources at goal: current position %s, resources: %s", base.name, sender, position, resources)
+            await base.viz_send_message(f"Rover {sender} discovered {len(resources)} resources at {position}")
+
+            for resource in resources:
+                entry = base.resources[resource]
+                entry["count"] += 1
+                entry["positions"].append(position)
+                await base.viz_report_resource(resource, position[0], position[1])
+
+        async def on_rover_returned(self, msg: Message, sender: str):
+            """
+            Make a returning rover available again and tell the drones.
+
+            Args:
+                msg (Message): Inform message from a rover.
+                sender (str): Short name of the rover.
+            """
+            base = self.agent
+            logger.info("[%s] Rover %s returned to base", base.name, sender)
+            await base.viz_send_message(f"Rover {sender} returned to base")
+            base.rovers.add(str(msg.sender))
+
+            body = encode({"inform": "has_rovers_available"})
+            for drone in base.drones:
+                logger.debug("[%s] Sending inform bid to %s, rovers available", base.name, drone)
+                await self.send(make_message(drone, _DRONE_INFORM_META, body))
 
     async def setup(self):
         """
@@ -351,12 +426,12 @@ class Base(VisualizationMixin, Agent):
         Registers message receiving behavior and visualization updates.
         Announces base operational status.
         """
-        print(f"{MAGENTA}[{self.name}] Base operational at position {self.position}{RESET}")
+        logger.info("[%s] Base operational at position %s", self.name, self.position)
         await self.viz_send_message(f"Base operational at position {self.position}")
         await self.viz_update_status("running")
-        self.add_behaviour(self.ReceiveMessages())
+        self.add_behaviour(self.ReceiveMessages(), _BASE_INBOX_TEMPLATE)
 
-        if hasattr(self, "viz_server"):
+        if self.viz_server is not None:
             self.add_behaviour(VisualizationBehaviour())
 
     async def stop(self):
@@ -366,14 +441,14 @@ class Base(VisualizationMixin, Agent):
         Prints a summary of all discovered resources with their counts
         and locations before stopping the agent.
         """
-        print(f"{MAGENTA}[{self.name}] Base shutting down...{RESET}")
+        logger.info("[%s] Base shutting down...", self.name)
         await self.viz_send_message(f"Base shutting down")
 
-        print(f"{MAGENTA}Collected...{RESET}")
+        logger.info("Collected...")
         for resource, value in self.resources.items():
-            print(f"{MAGENTA}  Found {resource}:{RESET}")
-            print(f"{MAGENTA}    count = {value['count']}{RESET}")
-            print(f"{MAGENTA}    positions = {value['positions']}{RESET}")
+            logger.info("  Found %s:", resource)
+            logger.info("    count = %s", value['count'])
+            logger.info("    positions = %s", value['positions'])
         await self.viz_send_message(f"Collected {str(self.resources)}")
                 
         await super().stop()
@@ -0,0 +1,42 @@
+import json
+
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class Bid:
+    """
+    A rover's proposal in the Contract Net negotiation with its base.
+
+    Attributes:
+        cost (float): Estimated mission time offered by the rover.
+        rover (str): JID of the bidding rover.
+    """
+    cost: float
+    rover: str
+
+    def encode(self) -> str:
+        """
+        Serialize the bid into a message body.
+
+        Returns:
+            str: JSON body with the bid fields.
+        """
+        return json.dumps({"cost": self.cost, "rover": self.rover})
+
+    @classmethod
+    def decode(cls, body: str) -> "Bid":
+        """
+        Parse a bid from a message body.
+
+        Args:
+            body (str): JSON body produced by `Bid.encode`.
+
+        Returns:
+            Bid: The decoded bid; a missing cost is treated as infinitely expensive.
+
+        Raises:
+            KeyError: If the body carries no rover JID.
+            ValueError: If the body is not valid JSON or the cost is not numeric.
+        """
+        data = json.loads(body)
+        return cls(cost=float(data.get("cost", float("inf"))), rover=str(data["rover"]))
@@ -1,19 +1,54 @@
 import asyncio
+import logging
 import random
 
-from typing import Dict, Tuple, List
+from functools import lru_cache
+
+from typing import Dict, Tuple, List, Set
 
 from spade.agent import Agent
 from spade.behaviour import CyclicBehaviour, OneShotBehaviour, State
 from spade.message import Message
+from spade.template import Template
 
 from world.world import World, WorldObject
 from world.map import Map
 
+from agents.bids import Bid
+from agents.messages import encode, decode, make_message
 from agents.visualizator import VisualizationBehaviour, VisualizationMixin
 
 from settings import *
 
+logger = logging.getLogger(__name__)
+
+# Metadata shared by every message of a kind; copied into each message, never mutated
+_CFP_META = {"performative": "cfp", "type": "rover_mission_cfp"}
+_ACCEPT_META = {"performative": "accept_proposal", "type": "rover_bid_accepted"}
+_REJECT_META = {"performative": "reject_proposal", "type": "rover_bid_rejected"}
+
+# Base replies to a CFP go to the running negotiation; everything else (availability informs) to the inbox
+_NEGOTIATION_TEMPLATE = (
+    Template(metadata={"performative": "propose"})
+    | Template(metadata={"performative": "refuse"})
+    | Template(metadata={"performative": "not-understood"})
+    | Template(metadata={"performative": "failure"})
+)
+_DRONE_INBOX_TEMPLATE = ~_NEGOTIATION_TEMPLATE
+
+@lru_cache(maxsize=None)
+def _short(jid: str) -> str:
+    """
+    Strip the domain from a JID for display, memoized per JID.
+
+    Args:
+        jid (str): Full JID.
+
+    Returns:
+        str: The local part of the JID.
+    """
+    return jid.split("@", 1)[0]
+
 class Drone(VisualizationMixin, Agent):
     """
     Aerial surveillance drone for terrain scanning and mission coordination.
@@ -28,11 +63,11 @@ class Drone(VisualizationMixin, Agent):
         position (Tuple[float, float]): Current (x, y) coordinates of the drone.
         height (float): Altitude above ground in kilometers.
         scan_radius (float): Detection radius for terrain scanning.
-        bases (List[str]): List of available base station JIDs.
-        non_available_bases (List[str]): List of base JIDs currently without rovers.
+        bases (Set[str]): Available base station JIDs.
+        non_available_bases (Set[str]): Base JIDs currently without rovers.
         areas_of_interest (List[Tuple[float, float]]): Detected locations needing exploration.
-        current_scan_position (List[float]): Current scanning window position.
-        proposals (Dict[str, Dict]): Temporary storage for base bids during negotiation.
+        current_scan_position (Tuple[float, float]): Current scanning window position.
+        proposals (Dict[str, Bid]): Temporary storage for base bids during negotiation, keyed by base JID.
         viz_server: Visualization server connection.
     """
     
@@ -70,15 +105,18 @@ class Drone(VisualizationMixin, Agent):
         self.height = height
         self.scan_radius = scan_radius
 
-        self.bases = known_bases
-        self.non_available_bases = []
-
-        self.areas_of_interest = []
-        self.current_scan_position = [0, 0]
-        self.proposals: Dict[str, Dict] = {}
+        self.bases: Set[str] = set(known_bases)
+        self.non_available_bases: Set[str] = set()
 
         self.areas_of_interest: List[Tuple[float, float]] = []
-        self.current_scan_position = list(self.position)
+        self.current_scan_position = tuple(self.position)
+        self.proposals: Dict[str, Bid] = {}
+
+        # Set while ScanTerrain may run; cleared during negotiations and base rechecks
+        self._can_scan = asyncio.Event()
+        self._can_scan.set()
+        # Set when a base reports available rovers, ending a base recheck early
+        self._base_wakeup = asyncio.Event()
 
         self.viz_server = viz_server
         if self.viz_server:
@@ -105,12 +143,31 @@ class Drone(VisualizationMixin, Agent):
             """
             Initialize terrain scanning and announce start.
             """
-            print(f"{GREEN}[{self.agent.name}] Starting terrain scanning...{RESET}")
-            await self.agent.viz_send_message("Starting terrain scanning")
+            drone = self.agent
+            # Map dimensions are fixed for the run, so resolve them once per scan behaviour
+            self._rate = max(1, drone.map.length // SCAN_MAP_SIZE)
+            self._cols = drone.map.length // self._rate + 1
+            self._cells = self._cols * (drone.map.height // self._rate + 1)
+
+            # The scan walks the stride grid row by row; start from the cell holding the current window
+            sx, sy = drone.current_scan_position
+            self._tick = (int(sy) // self._rate) * self._cols + int(sx) // self._rate
+
+            # The drone hovers in place, so the grid points inside its scan radius never change
+            px, py = drone.position
+            radius_sq = drone.scan_radius ** 2
+            self._in_radius = frozenset(
+                (col * self._rate, row * self._rate)
+                for row in range(self._cells // self._cols)
+                for col in range(self._cols)
+                if (px - col * self._rate) ** 2 + (py - row * self._rate) ** 2 <= radius_sq
+            )
+
+            logger.info("[%s] Starting terrain scanning...", drone.name)
+            await drone.viz_send_message("Starting terrain scanning")
 
         def in_scan_radius(self, scan_pos: Tuple[int, int]):
-            drone = self.agent
-            return ((drone.position[0] - scan_pos[0]) ** 2 + (drone.position[1] - scan_pos[1]) ** 2) <= drone.scan_radius ** 2
+            return scan_pos in self._in_radius
 
         def is_area_of_interest(self) -> bool:
             """
@@ -130,34 +187,30 @@ class Drone(VisualizationMixin, Agent):
             by scheduling recheck behavior.
             """
             drone = self.agent
+            await drone._can_scan.wait()
 
-            rate = drone.map.length // SCAN_MAP_SIZE
-            drone.current_scan_position[0] += rate
-            if drone.current_scan_position[0] > drone.map.length:
-                drone.current_scan_position[0] = 0
-                drone.current_scan_position[1] += rate
+            rate = self._rate
+            self._tick = (self._tick + 1) % self._cells
+            row, col = divmod(self._tick, self._cols)
 
-            if drone.current_scan_position[1] > drone.map.height:
-                drone.current_scan_position[1] = 0
+            scan_pos = drone.current_scan_position = (col * rate, row * rate)
 
-            scan_pos = tuple(drone.current_scan_position)
-
-            print(f"{GREEN}[{drone.name}] Scanning area: {scan_pos}{RESET}")
+            logger.debug("[%s] Scanning area: %s", drone.name, scan_pos)
             
             if self.is_area_of_interest() and self.in_scan_radius(scan_pos):
                 drone.areas_of_interest.append(scan_pos)
-                print(f"{GREEN}[{drone.name}] Area of interest detected at {scan_pos}{RESET}")
+                logger.info("[%s] Area of interest detected at %s", drone.name, scan_pos)
                 await drone.viz_send_message(f"Area of interest detected at {scan_pos}")
                 
+                # Scanning pauses until the negotiation or recheck sets the gate again
+                drone._can_scan.clear()
                 if not drone.bases:
-                    print(f"{GREEN}[{drone.name}] No bases available. Trying later...{RESET}")
+                    logger.info("[%s] No bases available. Trying later...", drone.name)
                     await drone.viz_send_message("No bases available - will retry later")
-                    self.kill()
                     drone.add_behaviour(drone.RecheckBaseAvailability())
                     return
 
-                self.kill()
-                drone.add_behaviour(drone.RequestAgentForMission(scan_pos))
+                drone.add_behaviour(drone.RequestAgentForMission(scan_pos), _NEGOTIATION_TEMPLATE)
 
     class RequestAgentForMission(OneShotBehaviour):
         """
@@ -179,6 +232,9 @@ class Drone(VisualizationMixin, Agent):
             """
             super().__init__()
             self.target_position = target_position
+            # Cheapest proposal seen so far, kept up to date as bids arrive
+            self._best_base = None
+            self._best_cost = float('inf')
 
         async def run(self):
             """
@@ -190,24 +246,30 @@ class Drone(VisualizationMixin, Agent):
             """
             drone = self.agent
  
-            for base_jid in drone.bases:
-                msg = Message(to=base_jid)
-                msg.set_metadata("performative", "cfp")
-                msg.set_metadata("type", "rover_mission_cfp")
-                msg.body = str(self.target_position)
-                await self.send(msg)
-                print(f"{GREEN}[{drone.name}] CFP sent to {base_jid} for mission at {self.target_position}{RESET}")
+            body = encode(self.target_position)
+            cfps = [make_message(str(base_jid), _CFP_META, body) for base_jid in drone.bases]
+            await asyncio.gather(*(self.send(msg) for msg in cfps))
+            for msg in cfps:
+                logger.debug("[%s] CFP sent to %s for mission at %s", drone.name, msg.to, self.target_position)
             
             await drone.viz_send_message(f"Requesting mission bids for target {self.target_position}")
 
-            timeout = 4
-
-            start_time = asyncio.get_event_loop().time()
-
-            while asyncio.get_event_loop().time() - start_time < timeout:
-                msg = await self.receive(timeout=1)
+            awaiting = {str(msg.to) for msg in cfps}
+            loop = asyncio.get_event_loop()
+            start_time = loop.time()
+            min_deadline = start_time + CFP_MIN_TIMEOUT
+            max_deadline = start_time + CFP_MAX_TIMEOUT
+
+            # Wake only when a reply arrives; once every base has answered, close
+            # the round after the minimum window instead of the full timeout
+            while True:
+                remaining = (max_deadline if awaiting else min_deadline) - loop.time()
+                if remaining <= 0:
+                    break
+                msg = await self.receive(timeout=remaining)
                 if msg:
                     perf = msg.metadata.get("performative")
+                    awaiting.discard(str(msg.sender))
                     if perf == "propose":
                         await self.on_propose(msg)
                     elif perf == "refuse":
@@ -216,11 +278,14 @@ class Drone(VisualizationMixin, Agent):
                         self.on_not_understood(msg)
                     elif perf == "failure":
                         self.on_failure(msg)
-                    elif perf == "inform":
-                        self.on_inform(msg)
 
             await self.on_all_responses_received()
-            drone.add_behaviour(drone.ScanTerrain())
+
+        async def on_end(self):
+            """
+            Resume terrain scanning once the negotiation is over, even if it failed.
+            """
+            self.agent._can_scan.set()
             
         def on_refuse(self, message: Message):
             """
@@ -232,30 +297,11 @@ class Drone(VisualizationMixin, Agent):
                 message (Message): Refusal message containing reason.
             """
             drone = self.agent
-            reason = eval(message.body)["reason"]
-            print(f"{GREEN}[{drone.name}] Base {str(message.sender).split('@')[0]} refused to bid for mission at {self.target_position}: reason - {reason}{RESET}")
+            reason = decode(message.body)["reason"]
+            logger.info("[%s] Base %s refused to bid for mission at %s: reason - %s", drone.name, _short(str(message.sender)), self.target_position, reason)
             if reason == "no_rovers_available":
-               drone.bases.remove(message.sender) 
-               drone.non_available_bases.append(message.sender)
-
-        def on_inform(self, message: Message):
-            """
-            Handle informational messages from bases.
-            
-            Processes base availability updates and moves bases back to
-            available list when rovers become ready.
-            
-            Args:
-                message (Message): Inform message with status update.
-            """
-            drone = self.agent
-            msg_info = eval(message.body)["inform"]
-            print(f"{GREEN}[{drone.name}] message info {msg_info}{RESET}") 
-
-            if msg_info == "has_rovers_available":
-                print(f"{GREEN}[{drone.name}] Base {str(message.sender).split('@')[0]} informed it has rovers available{RESET}")
-                drone.non_available_bases.remove(message.sender)
-                drone.bases.append(message.sender)
+               drone.bases.discard(str(message.sender))
+               drone.non_available_bases.add(str(message.sender))
 
         def on_failure(self, message: Message):
             """
@@ -264,7 +310,7 @@ class Drone(VisualizationMixin, Agent):
             Args:
                 message (Message): Failure notification from base.
             """
-            print(f"{GREEN}[{self.agent.name}] Base {str(message.sender).split('@')[0]} failed during the contract net protocol.{RESET}")
+            logger.warning("[%s] Base %s failed during the contract net protocol.", self.agent.name, _short(str(message.sender)))
 
         def on_not_understood(self, message: Message):
             """
@@ -273,7 +319,7 @@ class Drone(VisualizationMixin, Agent):
             Args:
                 message (Message): Not-understood notification from base.
             """
-            print(f"{GREEN}[{self.agent.name}] Base {str(message.sender).split('@')[0]} did not understand the CFP.{RESET}")
+            logger.warning("[%s] Base %s did not understand the CFP.", self.agent.name, _short(str(message.sender)))
 
         async def on_propose(self, message: Message):
             """
@@ -285,22 +331,34 @@ class Drone(VisualizationMixin, Agent):
             Args:
                 message (Message): Proposal message containing bid details.
             """
+            drone = self.agent
             try:
-                bid_data = eval(message.body)
-                cost = float(bid_data.get("cost", float('inf')))
-                base_jid = bid_data.get("base")
-                rover_jid = bid_data.get("rover")
-                
-                print(f"{GREEN}[{self.agent.name}] Received PROPOSAL from base: {base_jid}: Cost={cost}, Rover={rover_jid}{RESET}")
-                await self.agent.viz_send_message(f"Received bid from {str(base_jid).split('@')[0]} (cost: {cost:.1f}s)")
-                                
-                if base_jid is not None and rover_jid is not None:
-                    self.agent.proposals[base_jid] = {"cost": cost, "base": base_jid, "rover": rover_jid, "proposal_msg": message}
-                else:
-                    print(f"{GREEN}[{self.agent.name}] Ignoring invalid proposal from {message.sender}: No 'rover' specified.{RESET}")
-            
+                bid_data = decode(message.body)
+                cost = float(bid_data["cost"])
+                base_jid = bid_data["base"]
+                rover_jid = bid_data["rover"]
+            except KeyError:
+                logger.warning("[%s] Ignoring invalid proposal from %s: No 'rover' specified.", drone.name, message.sender)
+                return
             except (SyntaxError, TypeError, ValueError):
-                print(f"{GREEN}[{self.agent.name}] Invalid proposal format from {message.sender}. Body: {message.body}{RESET}")
+                logger.warning("[%s] Invalid proposal format from %s. Body: %s", drone.name, message.sender, message.body)
+                return
+
+            logger.info("[%s] Received PROPOSAL from base: %s: Cost=%s, Rover=%s", drone.name, base_jid, cost, rover_jid)
+            await drone.viz_send_message(f"Received bid from {_short(str(base_jid))} (cost: {cost:.1f}s)")
+
+            # A bid from every known base is the most a round can hold; anything beyond is spam
+            if base_jid not in drone.proposals and len(drone.proposals) >= len(drone.bases) + len(drone.non_available_bases):
+                logger.warning("[%s] Ignoring proposal from %s: proposal limit reached.", drone.name, message.sender)
+                return
+
+            drone.proposals[base_jid] = Bid(cost=cost, rover=rover_jid)
+            if self._best_base is None or cost < self._best_cost:
+                self._best_base, self._best_cost = base_jid, cost
+            elif base_jid == self._best_base and cost > self._best_cost:
+                # The leader raised its own bid, so another base may now be cheaper
+                self._best_base, best_bid = min(drone.proposals.items(), key=lambda x: x[1].cost)
+                self._best_cost = best_bid.cost
 
         async def on_all_responses_received(self):
             """
@@ -311,54 +369,38 @@ class Drone(VisualizationMixin, Agent):
             Handles case where no valid proposals are received.
             """
             drone = self.agent
-            print(f"{GREEN}[{drone.name}] All responses received for mission at {self.target_position}.{RESET}")
+            logger.debug("[%s] All responses received for mission at %s.", drone.name, self.target_position)
 
             if not drone.proposals:
-                print(f"{GREEN}[{drone.name}] No proposals received for mission at {self.target_position}. Retrying later.{RESET}")
+                logger.info("[%s] No proposals received for mission at %s. Retrying later.", drone.name, self.target_position)
                 await drone.viz_send_message(f"No bids received for {self.target_position} - will retry")
-                drone.proposals = {} 
+                drone.proposals.clear()
                 return
 
-            best_base, best_data = min(drone.proposals.items(), key=lambda x: x[1]["cost"])           
-            min_cost = best_data['cost']
+            best_base = self._best_base
+            best_data = drone.proposals[best_base]
+            min_cost = self._best_cost
 
             if best_base:
-                print(f"{GREEN}[{drone.name}] Accepting proposal from {best_base} with cost {min_cost}{RESET}")
-                await drone.viz_send_message(f"Accepted bid from {str(best_base).split('@')[0]} for mission to {self.target_position}")
-
-                accept_msg = Message(to=best_base)
-                accept_msg.set_metadata("performative", "accept_proposal")
-                accept_msg.set_metadata("type", "rover_bid_accepted")
-                accept_msg.body = str({"target": self.target_position, "rover": best_data["rover"]})
+                logger.info("[%s] Accepting proposal from %s with cost %s", drone.name, best_base, min_cost)
+                await drone.viz_send_message(f"Accepted bid from {_short(str(best_base))} for mission to {self.target_position}")
 
-                await self.send(accept_msg)
+                accept_msg = make_message(best_base, _ACCEPT_META, encode({"target": self.target_position, "rover": best_data.rover}))
 
+                replies = [accept_msg]
                 for base_jid, data in drone.proposals.items():
                     if base_jid != best_base:
-                        print(f"{GREEN}[{drone.name}] Rejecting proposal from {base_jid}{RESET}")
-                        reject_msg = Message(to=base_jid)
-                        reject_msg.set_metadata("performative", "reject_proposal")
-                        reject_msg.set_metadata("type", "rover_bid_rejected")
-                        reject_msg.body = str({"target": self.target_position, "rover": data["rover"]})
+                        replies.append(make_message(base_jid, _REJECT_META, encode({"target": self.target_position, "rover": data.rover})))
 
-                        await self.send(reject_msg)
+                # The accept and every reject go out together instead of one round-trip each
+                await asyncio.gather(*(self.send(reply) for reply in replies))
+                for reply in replies[1:]:
+                    logger.info("[%s] Rejecting proposal from %s", drone.name, reply.to)
             else:
-                print(f"{GREEN}[{drone.name}] No suitable proposals received for mission at {self.target_position}. Retrying later.{RESET}")
+                logger.info("[%s] No suitable proposals received for mission at %s. Retrying later.", drone.name, self.target_position)
                 await drone.viz_send_message(f"No suitable bids for {self.target_position} - will retry")
 
-            drone.proposals = {}
-
-        async def on_inform(self, message: Message):
-            """
-            Handle mission confirmation from winning base.
-            
-            Receives acknowledgment that rover has been assigned to the mission.
-            
-            Args:
-                message (Message): Inform message with mission details.
-            """
-            sender = str(message.sender)
-            print(f"{GREEN}[{self.agent.name}] Received INFORM from winning base {sender}.{RESET}")
+            drone.proposals.clear()
 
     class ReceiveMessages(CyclicBehaviour):
         """
@@ -367,55 +409,81 @@ class Drone(VisualizationMixin, Agent):
         Handles base availability updates and other inform messages.
         """
         
+        async def on_start(self):
+            """
+            Map performatives to their handlers.
+            """
+            self.handlers = {
+                "inform": self.on_inform,
+            }
+
         async def run(self):
             """
             Receive and process messages about base status changes.
             
-            Updates base availability when rovers return and become ready
+            Blocks until a message arrives instead of polling, and dispatches
+            it to the handler registered for its performative.
+            """
+            msg = await self.receive(timeout=10)
+            if not msg:
+                return
+
+            perf = msg.metadata.get("performative")
+            logger.debug("[%s] Message received from %s (type: %s)", self.agent.name, _short(str(msg.sender)), msg.metadata.get("type"))
+
+            handler = self.handlers.get(perf)
+            if handler is not None:
+                await handler(msg)
+
+        async def on_inform(self, msg: Message):
+            """
+            Update base availability when rovers return and become ready
             for new missions.
+            
+            Args:
+                msg (Message): Inform message from a base.
             """
             drone = self.agent
-            msg = await self.receive()
-
-            if msg:
-                perf = msg.metadata.get("performative")
-                msg_type = msg.metadata.get("type")
-                sender = str(msg.sender).split("@")[0]
-              
-                print(f"{GREEN}[{drone.name}] Message received from {sender} (type: {msg_type}){RESET}")
-
-                if perf == "inform":
-                    msg_info = eval(msg.body)["inform"]
-                    if msg_info == "has_rovers_available":
-                        print(f"{GREEN}[{drone.name}] Base {sender} informed it has rovers available{RESET}")
-                        await drone.viz_send_message(f"Base {sender} now has rovers available")
-                        drone.non_available_bases.remove(msg.sender)
-                        drone.bases.append(msg.sender)
+            sender = _short(str(msg.sender))
+            msg_info = decode(msg.body)["inform"]
+            if msg_info == "has_rovers_available":
+                logger.info("[%s] Base %s informed it has rovers available", drone.name, sender)
+                await drone.viz_send_message(f"Base {sender} now has rovers available")
+                drone.non_available_bases.discard(str(msg.sender))
+                drone.bases.add(str(msg.sender))
+                drone._base_wakeup.set()
 
     class RecheckBaseAvailability(CyclicBehaviour):
         """
         Periodically restore unavailable bases to retry mission assignments.
         
-        After a delay, moves all bases from non-available back to available list
-        and resumes terrain scanning.
+        Once a base reports available rovers, or after a delay at the latest,
+        moves all bases from non-available back to available list and resumes
+        terrain scanning.
         """
         
         async def run(self):
             """
-            Wait 30 seconds then restore all bases and resume scanning.
+            Wait up to 30 seconds for a base to report available rovers, then
+            restore all bases and resume scanning.
             
             Moves bases from non_available_bases back to bases list and
-            restarts the terrain scanning behavior.
+            lets the terrain scanning behavior resume.
             """
             drone = self.agent
-            await asyncio.sleep(30)
-
-            print(f"{GREEN}[{drone.name}] preparing to check base availability{RESET}")
+            drone._base_wakeup.clear()
+            if not drone.bases:
+                try:
+                    await asyncio.wait_for(drone._base_wakeup.wait(), timeout=30)
+                except asyncio.TimeoutError:
+                    pass
+
+            logger.info("[%s] preparing to check base availability", drone.name)
             await drone.viz_send_message("Rechecking base availability")
-            drone.bases.extend(drone.non_available_bases)
-            drone.non_available_bases = []
+            drone.bases |= drone.non_available_bases
+            drone.non_available_bases.clear()
 
-            drone.add_behaviour(drone.ScanTerrain())
+            drone._can_scan.set()
             self.kill()
 
     async def setup(self):
@@ -425,14 +493,14 @@ class Drone(VisualizationMixin, Agent):
         Registers terrain scanning, message receiving, and visualization behaviors.
         Announces drone online status.
         """
-        print(f"{GREEN}Initializing [{self.name}] drone.{RESET}")
+        logger.info("Initializing [%s] drone.", self.name)
         await asyncio.sleep(2)
         await self.viz_update_status("running")
         self.add_behaviour(self.ScanTerrain())
-        self.add_behaviour(self.ReceiveMessages())
+        self.add_behaviour(self.ReceiveMessages(), _DRONE_INBOX_TEMPLATE)
 
-        if hasattr(self, "viz_server"):
+        if self.viz_server is not None:
             self.add_behaviour(VisualizationBehaviour())
 
-        print(f"{GREEN}[{self.name}] Drone online at height {self.height} km{RESET}")
+        logger.info("[%s] Drone online at height %s km", self.name, self.height)
         await self.viz_send_message(f"Drone online at height {self.height} km")
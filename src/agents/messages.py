@@ -0,0 +1,64 @@
+import ast
+import json
+
+from typing import Any, Dict
+
+from spade.message import Message
+
+def encode(payload: Any) -> str:
+    """
+    Serialize a message payload into a message body.
+
+    Tuples are written as JSON arrays, so receivers that need a position
+    back as a tuple must convert it.
+
+    Args:
+        payload (Any): JSON-serializable payload.
+
+    Returns:
+        str: JSON body.
+    """
+    return json.dumps(payload)
+
+def decode(body: str) -> Any:
+    """
+    Parse a message body produced by `encode`.
+
+    Bodies that are not JSON are parsed as Python literals, which keeps
+    peers that still send `str(payload)` bodies working.
+
+    Args:
+        body (str): Message body.
+
+    Returns:
+        Any: The decoded payload.
+
+    Raises:
+        SyntaxError: If the body is neither JSON nor a Python literal.
+        ValueError: If the body is neither JSON nor a Python literal.
+    """
+    try:
+        return json.loads(body)
+    except ValueError:
+        return ast.literal_eval(body)
+
+def make_message(to: str, meta: Dict[str, str], body: str) -> Message:
+    """
+    Build a message from a shared metadata template.
+
+    Templates are module-level dicts built once per message kind; they are
+    copied into each message and never mutated. Messages themselves are not
+    reused, since SPADE keeps every sent message in the agent's trace store.
+
+    Args:
+        to (str): Recipient JID.
+        meta (Dict[str, str]): Metadata template to copy into the message.
+        body (str): Message body.
+
+    Returns:
+        Message: The ready-to-send message.
+    """
+    msg = Message(to=to)
+    msg.metadata.update(meta)
+    msg.body = body
+    return msg
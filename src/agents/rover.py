@@ -1,20 +1,47 @@
-import spade
 import asyncio
+import logging
 import random
-from math import sqrt
+from collections import OrderedDict
+from math import cos, dist, pi, sin
 from typing import Tuple, List, Dict, Optional
 
 from spade.agent import Agent
-from spade.behaviour import CyclicBehaviour
-from spade.message import Message
+from spade.behaviour import CyclicBehaviour, OneShotBehaviour
 
-from world.world import World, WorldObject
+from world.world import World, COLLISION_RADIUS_SQ
 from world.map import Map, AStar
 
 from settings import *
 
+from agents.bids import Bid
+from agents.messages import encode, decode, make_message
 from agents.visualizator import VisualizationBehaviour, VisualizationMixin
 
+logger = logging.getLogger(__name__)
+
+# Energy a mission must budget per unit of path length: round trip with margin plus expected storm drain
+MISSION_ENERGY_PER_DISTANCE = (2.2 + 0.10 * STORM_CHANCE * STORM_COST) * ENERGY_PER_DISTANCE_UNIT
+
+# Unit vectors for the 8 compass directions probed when stepping around an obstacle
+_PROBE_DIRECTIONS: Tuple[Tuple[float, float], ...] = tuple(
+    (cos(k * pi / 4), sin(k * pi / 4)) for k in range(8)
+)
+
+# Metadata shared by every message of a kind; copied into each message, never mutated
+_REFUSE_META = {"performative": "refuse", "type": "rover_bid_cfp"}
+_PROPOSE_META = {"performative": "propose", "type": "rover_bid_cfp"}
+_LEAVING_META = {"performative": "inform", "type": "rover_leaving_base"}
+_MISSION_COMPLETE_META = {"performative": "inform", "type": "mission_complete"}
+_RETURNED_META = {"performative": "inform", "type": "rover_returned_to_base"}
+_RESOURCES_META = {"performative": "inform", "type": "resources_found"}
+
+# Independent chance of finding each resource in one soil analysis
+RESOURCE_PROBS: Tuple[Tuple[str, float], ...] = (
+    ("iron", 0.3),
+    ("silicon", 0.2),
+    ("water_ice", 0.1),
+)
+
 class Rover(VisualizationMixin, Agent):
     """
     Rover agent responsible for pathfinding, movement, bidding for missions,
@@ -34,7 +61,7 @@ class Rover(VisualizationMixin, Agent):
         is_on_base (bool): Whether rover is currently on base.
         move_step (float): Maximum distance rover can move per tick.
         obstacle_radius (float): Collision radius for obstacles.
-        resource_probs (Dict[str, float]): Probabilities of discovering resources.
+        resource_probs (Tuple[Tuple[str, float], ...]): (resource, probability) pairs for soil analysis.
         viz_server: Visualization server reference.
     """
 
@@ -78,19 +105,22 @@ class Rover(VisualizationMixin, Agent):
         self.curr = 0
         self.path: List[Tuple[float, float]] = []
         self.goal: Optional[Tuple[float, float]] = None
+        # Map version the current path was planned against
+        self._path_map_version = -1
 
         self.status = "idle"
         self.is_locked_by_bid = False
         self.is_on_base = True
+        # Set when the rover docks; Charge sleeps on it while away or full
+        self._docked = asyncio.Event()
+        self._docked.set()
 
         self.move_step = move_step
         self.obstacle_radius = obstacle_radius
 
-        self.resource_probs = {
-            "iron": 0.3,
-            "silicon": 0.2,
-            "water_ice": 0.1,
-        }
+        self._path_cost_cache: OrderedDict[Tuple[float, float, float, float], float] = OrderedDict()
+
+        self.resource_probs = RESOURCE_PROBS
 
         self.viz_server = viz_server
         if self.viz_server:
@@ -121,7 +151,9 @@ class Rover(VisualizationMixin, Agent):
 
     async def try_go_around(self, goal: Tuple[float, float]) -> Optional[Tuple[float, float]]:
         """
-        Attempt simple local obstacle avoidance using random offsets.
+        Attempt simple local obstacle avoidance by probing the 8 compass
+        directions around the rover, those pointing closest to the goal first.
+        Each probe lies one obstacle radius away from the current position.
 
         Args:
             goal (Tuple[float, float]): Target waypoint.
@@ -129,14 +161,19 @@ class Rover(VisualizationMixin, Agent):
         Returns:
             Optional[Tuple[float, float]]: New temporary position or None.
         """
-        for _ in range(5):
-            offset_x = random.uniform(-0.5 * ROVER_SPEED_UNIT_PER_SEC, 0.5 * ROVER_SPEED_UNIT_PER_SEC)
-            offset_y = random.uniform(-0.5 * ROVER_SPEED_UNIT_PER_SEC, 0.5 * ROVER_SPEED_UNIT_PER_SEC)
-            candidate = (self.position[0] + offset_x, self.position[1] + offset_y)
-            if not self.world.collides(self.jid, candidate):
-                print(f"{CYAN}[{self.name}] Avoiding obstacle locally → {candidate}{RESET}")
-                return candidate
-        return None
+        probe_dist = self.obstacle_radius
+        x, y = self.position
+        gx, gy = goal[0] - x, goal[1] - y
+        candidates = [
+            (x + dx * probe_dist, y + dy * probe_dist)
+            for dx, dy in sorted(_PROBE_DIRECTIONS, key=lambda d: -(d[0] * gx + d[1] * gy))
+        ]
+        blocked = self.world.collides_batch(self.jid, candidates)
+        if all(blocked):
+            return None
+        candidate = candidates[blocked.index(False)]
+        logger.debug("[%s] Avoiding obstacle locally → %s", self.name, candidate)
+        return candidate
 
     async def find_path(self) -> str:
         """
@@ -148,25 +185,24 @@ class Rover(VisualizationMixin, Agent):
         rover = self
 
         rover.path = AStar.run(rover.map, rover.position, rover.goal)
+        rover._path_map_version = rover.map.version
         if not rover.path:
-            print(f"{CYAN}[{rover.name}] Did not find path to the goal, rejecting mission{RESET}")
+            logger.info("[%s] Did not find path to the goal, rejecting mission", rover.name)
             rover.status = "idle"
             rover.goal = None
             return "no_path"
-        print(f"{CYAN}[{rover.name}] Found path to the goal{RESET}")
-
-        distance = sum(
-            rover.calculate_distance(rover.path[i - 1], rover.path[i])
-            for i in range(1, len(rover.path))
-        )
-        if rover.energy < ((2.2 + 0.10 * STORM_CHANCE * STORM_COST) * distance) * ENERGY_PER_DISTANCE_UNIT:
-            print(f"{CYAN}[{rover.name}] Low on energy; rejecting mission to {rover.goal}{RESET}")
+        logger.debug("[%s] Found path to the goal", rover.name)
+
+        path = rover.path
+        distance = sum(map(dist, path, path[1:]))
+        if rover.energy < distance * MISSION_ENERGY_PER_DISTANCE:
+            logger.info("[%s] Low on energy; rejecting mission to %s", rover.name, rover.goal)
             rover.status = "idle"
             rover.goal = None
             rover.path = []
             return "not_enough_energy"
 
-        print(f"{CYAN}[{rover.name}] Found path to the goal and has enough energy; accepting mission to {rover.goal}{RESET}")
+        logger.info("[%s] Found path to the goal and has enough energy; accepting mission to %s", rover.name, rover.goal)
         rover.status = "moving"
         return "viable"
 
@@ -181,12 +217,32 @@ class Rover(VisualizationMixin, Agent):
         Returns:
             float: Euclidean distance.
         """
-        return sqrt((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2)
+        return dist(pos1, pos2)
+
+    def calculate_distance_sq(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float:
+        """
+        Compute the squared Euclidean distance between two points.
+
+        Use it instead of calculate_distance when the distance is only
+        compared against a squared threshold.
+
+        Args:
+            pos1 (Tuple[float, float]): First point.
+            pos2 (Tuple[float, float]): Second point.
+
+        Returns:
+            float: Squared Euclidean distance.
+        """
+        return (pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2
 
     def calculate_pathfinding_cost(self, start_pos: Tuple[float, float], target_pos: Tuple[float, float]) -> float:
         """
         Estimate pathfinding cost using randomized Euclidean distance.
 
+        Results are memoized per (start, target) pair quantized to 0.1 units,
+        so repeated bids for the same cells reuse the same estimate. The cache
+        is bounded to PATH_COST_CACHE_SIZE entries, evicting the oldest first.
+
         Args:
             start_pos (Tuple[float, float]): Starting point.
             target_pos (Tuple[float, float]): Target point.
@@ -194,8 +250,19 @@ class Rover(VisualizationMixin, Agent):
         Returns:
             float: Cost estimate.
         """
+        key = (round(start_pos[0], 1), round(start_pos[1], 1), round(target_pos[0], 1), round(target_pos[1], 1))
+        cost = self._path_cost_cache.get(key)
+        if cost is not None:
+            self._path_cost_cache.move_to_end(key)
+            return cost
+
         euclidean_dist = self.calculate_distance(start_pos, target_pos)
-        return euclidean_dist * random.uniform(1.0, 1.1)
+        cost = euclidean_dist * random.uniform(1.0, 1.1)
+
+        self._path_cost_cache[key] = cost
+        if len(self._path_cost_cache) > PATH_COST_CACHE_SIZE:
+            self._path_cost_cache.popitem(last=False)
+        return cost
 
     def compute_mission_time(self, target_pos: Tuple[float, float]) -> float:
         """
@@ -209,9 +276,8 @@ class Rover(VisualizationMixin, Agent):
         """
         current_energy = self.energy
 
-        dist_to_target = self.calculate_pathfinding_cost(self.position, target_pos)
-        dist_to_base_after = self.calculate_pathfinding_cost(target_pos, self.position)
-        total_distance = dist_to_target + dist_to_base_after
+        # The Euclidean leg is symmetric, so the round trip is twice one estimate
+        total_distance = 2 * self.calculate_pathfinding_cost(self.position, target_pos)
 
         energy_required = total_distance * ENERGY_PER_DISTANCE_UNIT
 
@@ -240,32 +306,34 @@ class Rover(VisualizationMixin, Agent):
 
             This method runs as a cyclic behaviour and increments the rover's
             energy by CHARGE_RATE_ENERGY_PER_SEC every second until the
-            battery reaches MAX_ROVER_CHARGE. It also prints textual status
-            messages at several charge thresholds.
+            battery reaches MAX_ROVER_CHARGE. It also logs textual status
+            messages at several charge thresholds. While the rover is away
+            or fully charged it waits for the rover to dock instead of
+            waking every second.
             """
             rover = self.agent
 
-            if rover.is_on_base:
-                if MAX_ROVER_CHARGE * 0.97 <= rover.energy <= MAX_ROVER_CHARGE * 0.99:
-                    print(f"{CYAN}[{self.agent.name}] Rover Max charge reached - Current Charge: 100%{RESET}")
+            if not rover.is_on_base or rover.energy >= MAX_ROVER_CHARGE:
+                rover._docked.clear()
+                await rover._docked.wait()
+                return
 
-                elif MAX_ROVER_CHARGE * 0.75 <= rover.energy <= MAX_ROVER_CHARGE * 0.80 :
-                    print(f"{CYAN}[{self.agent.name}] Rover Charging - Current Charge: 75%{RESET}")
-                
-                elif MAX_ROVER_CHARGE * 0.5 <= rover.energy <= MAX_ROVER_CHARGE * 0.55:
-                    print(f"{CYAN}[{self.agent.name}] Rover Charging - Current Charge: 50%{RESET}")
+            if MAX_ROVER_CHARGE * 0.97 <= rover.energy <= MAX_ROVER_CHARGE * 0.99:
+                logger.debug("[%s] Rover Max charge reached - Current Charge: 100%%", self.agent.name)
 
-                elif MAX_ROVER_CHARGE * 0.25 <= rover.energy <= MAX_ROVER_CHARGE * 0.30:
-                    print(f"{CYAN}[{self.agent.name}] Rover Charging - Current Charge: 25%{RESET}")
+            elif MAX_ROVER_CHARGE * 0.75 <= rover.energy <= MAX_ROVER_CHARGE * 0.80 :
+                logger.debug("[%s] Rover Charging - Current Charge: 75%%", self.agent.name)
+            
+            elif MAX_ROVER_CHARGE * 0.5 <= rover.energy <= MAX_ROVER_CHARGE * 0.55:
+                logger.debug("[%s] Rover Charging - Current Charge: 50%%", self.agent.name)
 
-                elif rover.energy == 0:
-                    print(f"{CYAN}[{rover.name}] Rover Charging - Current Charge: 0%{RESET}")
+            elif MAX_ROVER_CHARGE * 0.25 <= rover.energy <= MAX_ROVER_CHARGE * 0.30:
+                logger.debug("[%s] Rover Charging - Current Charge: 25%%", self.agent.name)
 
-                if rover.energy < MAX_ROVER_CHARGE:
-                    rover.energy += CHARGE_RATE_ENERGY_PER_SEC
+            elif rover.energy == 0:
+                logger.debug("[%s] Rover Charging - Current Charge: 0%%", rover.name)
 
-                if rover.energy >= MAX_ROVER_CHARGE:
-                    rover.energy = MAX_ROVER_CHARGE
+            rover.energy = min(rover.energy + CHARGE_RATE_ENERGY_PER_SEC, MAX_ROVER_CHARGE)
 
             await rover.viz_update_battery(100 * rover.energy / MAX_ROVER_CHARGE)
             await asyncio.sleep(1)
@@ -289,9 +357,9 @@ class Rover(VisualizationMixin, Agent):
             - reject_proposal: unlock and remain idle
             - inform (return_path_to_base): receive a return path and update state
 
-            The method uses eval() to parse message bodies that were serialized
-            with str(dict). It also forwards human-readable updates to the
-            visualizer.
+            Message bodies are parsed with the shared codec; positions arrive
+            as JSON arrays and are converted back to tuples. It also forwards
+            human-readable updates to the visualizer.
             """
             rover = self.agent
             msg = await self.receive(timeout=3)
@@ -306,20 +374,16 @@ class Rover(VisualizationMixin, Agent):
             # BASE → ROVER : Bid Request
             # --------------------------
             if performative == "cfp" and msg_type == "rover_bid_cfp":
-                target_pos = eval(msg.body)
-                print(f"{CYAN}[{rover.name}] Received Bid request from Base for {target_pos}{RESET}")
+                target_pos = tuple(decode(msg.body))
+                logger.info("[%s] Received Bid request from Base for %s", rover.name, target_pos)
                 await rover.viz_send_message(f"Received mission bid request for {target_pos}")
 
                 # Check if rover is free
                 if rover.is_locked_by_bid or rover.status != "idle":
                     # Already committed → refuse
-                    reply = Message(
-                        to=sender,
-                        metadata={"performative": "refuse", "type": "rover_bid_cfp"},
-                        body=str({"reason": "busy or locked"})
-                    )
+                    reply = make_message(sender, _REFUSE_META, encode({"reason": "busy or locked"}))
                     await self.send(reply)
-                    print(f"{CYAN}[{rover.name}] REFUSING mission at {target_pos} (busy/locked){RESET}")
+                    logger.info("[%s] REFUSING mission at %s (busy/locked)", rover.name, target_pos)
                     await rover.viz_send_message(f"Refused mission at {target_pos} (busy/locked)")
 
                 else:
@@ -330,35 +394,27 @@ class Rover(VisualizationMixin, Agent):
                     mission_status = await rover.find_path()
                     if mission_status != "viable":
                         rover.is_locked_by_bid = False
-                        reply = Message(
-                            to=sender,
-                            metadata={"performative": "refuse", "type": "rover_bid_cfp"},
-                            body=str({"reason": mission_status})
-                        )
+                        reply = make_message(sender, _REFUSE_META, encode({"reason": mission_status}))
                         await self.send(reply)
-                        print(f"{CYAN}[{rover.name}] REFUSING mission at {target_pos} ({mission_status}){RESET}")
+                        logger.info("[%s] REFUSING mission at %s (%s)", rover.name, target_pos, mission_status)
                         await rover.viz_send_message(f"Refused mission at {target_pos} ({mission_status})")
                         return
 
                     estimated_mission_time = rover.compute_mission_time(target_pos)
-                    proposal = {"cost": estimated_mission_time, "rover": str(rover.jid)}
-                    reply = Message(
-                        to=sender,
-                        metadata={"performative": "propose", "type": "rover_bid_cfp"},
-                        body=str(proposal)
-                    )
+                    proposal = Bid(cost=estimated_mission_time, rover=str(rover.jid))
+                    reply = make_message(sender, _PROPOSE_META, proposal.encode())
                     await self.send(reply)
-                    print(f"{CYAN}[{rover.name}] PROPOSING mission at {target_pos} with cost {estimated_mission_time:.2f}{RESET}")
+                    logger.info("[%s] PROPOSING mission at %s with cost %.2f", rover.name, target_pos, estimated_mission_time)
                     await rover.viz_send_message(f"Submitted bid for {target_pos} (cost: {estimated_mission_time:.1f}s)")
 
             # Go to target
             elif performative == "accept_proposal" and msg_type == "rover_bid_cfp":
                 rover.status = "moving"
-                rover.goal = eval(msg.body)["target"]
+                rover.goal = tuple(decode(msg.body)["target"])
                 rover.is_locked_by_bid = False  # Unlock after acceptance
                 rover.is_on_base = False # Out of base
 
-                print(f"{CYAN}[{rover.name}] ACCEPTED mission to {rover.goal}{RESET}")
+                logger.info("[%s] ACCEPTED mission to %s", rover.name, rover.goal)
                 await rover.viz_send_message(f"Mission accepted! Moving to {rover.goal}")
                 rover.add_behaviour(rover.MoveAlongPath())
 
@@ -368,18 +424,19 @@ class Rover(VisualizationMixin, Agent):
                 rover.status = "idle"
                 rover.goal = None
                 rover.path = []
-                print(f"{CYAN}[{rover.name}] REJECTED for mission at {eval(msg.body)['target']}{RESET}")
-                await rover.viz_send_message(f"Bid rejected for mission at {eval(msg.body)['target']}")
+                target_pos = tuple(decode(msg.body)["target"])
+                logger.info("[%s] REJECTED for mission at %s", rover.name, target_pos)
+                await rover.viz_send_message(f"Bid rejected for mission at {target_pos}")
 
             # --------------------------
             # Inform on rover stats
             # --------------------------
-            elif performative == "inform" and ontology == "return_path_to_base":
-                rover.path = eval(msg.body)
+            elif performative == "inform" and msg_type == "return_path_to_base":
+                rover.path = [tuple(step) for step in decode(msg.body)]
                 rover.goal = rover.path[-1] if rover.path else None
                 rover.status = "returning"
                 rover.is_locked_by_bid = False
-                print(f"[{rover.name}] Received return path ({len(rover.path)} steps) to base.")
+                logger.info("[%s] Received return path (%s steps) to base.", rover.name, len(rover.path))
 
     class MoveAlongPath(CyclicBehaviour):
         """
@@ -394,19 +451,16 @@ class Rover(VisualizationMixin, Agent):
         """
         async def on_start(self) -> None:
             """
-            Called when the behaviour is added to the agent. If the rover is in
-            the moving state it sends an inform message to the base announcing
-            departure.
+            Called when the behaviour is added to the agent. Restarts the walk
+            at the head of the current path and, if the rover is in the moving
+            state, sends an inform message to the base announcing departure.
             """
             rover = self.agent 
+            rover.curr = 0
 
             if rover.status == "moving":
-                print(f"{CYAN}[{rover.name}] Informing moving to goal to base{RESET}")
-                msg = Message(
-                    to=rover.base_jid,
-                    metadata={"performative": "inform", "type": "rover_leaving_base"},
-                    body=str({"goal": rover.goal})
-                )
+                logger.debug("[%s] Informing moving to goal to base", rover.name)
+                msg = make_message(rover.base_jid, _LEAVING_META, encode({"goal": rover.goal}))
                 await self.send(msg)
 
         async def run(self):
@@ -419,28 +473,24 @@ class Rover(VisualizationMixin, Agent):
             """
             rover = self.agent
 
-            if rover.goal == None:
-                print(f"{CYAN}[{rover.name}] No goal set, cancelling MoveAlongPath{RESET}")
+            if rover.goal is None:
+                logger.debug("[%s] No goal set, cancelling MoveAlongPath", rover.name)
                 self.kill()
-                await asyncio.sleep(2)
                 return
 
-            if rover.status not in ["moving", "returning"]:
-                print(f"{CYAN}[{rover.name}] Doing another task, cancelling MoveAlongPath{RESET}")
+            if rover.status not in ("moving", "returning"):
+                logger.debug("[%s] Doing another task, cancelling MoveAlongPath", rover.name)
                 self.kill()
-                await asyncio.sleep(2)
                 return
 
             if not rover.path:
-                print(f"{CYAN}[{rover.name}] could not compute path to goal {rover.goal}{RESET}")
+                logger.warning("[%s] could not compute path to goal %s", rover.name, rover.goal)
                 self.kill()
-                await asyncio.sleep(2)
                 return
             
             if rover.energy == 0:
-                print(f"{cyan}[{rover.name}] Rover ran out of energy{reset}")
+                logger.warning("[%s] Rover ran out of energy", rover.name)
                 self.kill()
-                await asyncio.sleep(2)
                 return
 
             s_path = len(rover.path)
@@ -448,10 +498,8 @@ class Rover(VisualizationMixin, Agent):
             if rover.curr >= s_path:
                 rover.curr = s_path - 1            
 
-            next_is_goal = (
-                (rover.status == "returning" or rover.status == "moving") and
-                rover.curr == s_path - 1
-            )
+            # The status guard above already pins the rover to moving/returning
+            next_is_goal = rover.curr == s_path - 1
 
             next_step = rover.path[rover.curr] if not next_is_goal else rover.goal
             dist_to_next_step = rover.calculate_distance(rover.position, next_step) 
@@ -460,10 +508,9 @@ class Rover(VisualizationMixin, Agent):
             step_strength = rover.move_step if not next_is_goal else min(rover.move_step, 1)
             step_size = min(step_strength, dist_to_next_step)
 
-            dx /= dist_to_next_step
-            dy /= dist_to_next_step
-
-            new_pos = (rover.position[0] + dx * step_size, rover.position[1] + dy * step_size)
+            # Normalize and scale the delta in one factor; a rover already on the waypoint stays put
+            scale = step_size / dist_to_next_step if dist_to_next_step > 0 else 0.0
+            new_pos = (rover.position[0] + dx * scale, rover.position[1] + dy * scale)
 
             rover.energy -= step_size * ENERGY_PER_DISTANCE_UNIT
 
@@ -483,23 +530,22 @@ class Rover(VisualizationMixin, Agent):
             ))
             s_collisions = len(collisions)
             if s_collisions > 0:
-                print(f"{CYAN}[{rover.name}] collision detected near {new_pos}, collisions: {collisions}{RESET}")
+                logger.warning("[%s] collision detected near %s, collisions: %s", rover.name, new_pos, collisions)
                 await rover.viz_send_message(f"collision detected! attempting to avoid obstacle")
 
                 alt = await rover.try_go_around(next_step)
                 if alt:
                     rover.position = alt
-                    print(f"{CYAN}[{rover.name}] avoided obstacle locally.{RESET}")
+                    logger.info("[%s] avoided obstacle locally.", rover.name)
                 else:
-                    print(f"{CYAN}[{rover.name}] could not avoid locally, crash.{RESET}")
+                    logger.warning("[%s] could not avoid locally, crash.", rover.name)
                     await rover.viz_send_message(f"crash: unable to avoid obstacle")
                     return
 
             else:
                 rover.position = new_pos
 
-                distance_after_move = rover.calculate_distance(rover.position, next_step)
-                arrived_next_step = distance_after_move <= COLLISION_RADIUS
+                arrived_next_step = rover.calculate_distance_sq(rover.position, next_step) <= COLLISION_RADIUS_SQ
                 if arrived_next_step:
                     rover.position = next_step if not next_is_goal else rover.goal
                     rover.curr += 1
@@ -507,9 +553,8 @@ class Rover(VisualizationMixin, Agent):
                 await rover.viz_update_position(rover.position)
                 await rover.viz_update_battery(100 * rover.energy / MAX_ROVER_CHARGE)
  
-                print(f"{CYAN}[{rover.name}] {rover.status}... current position: {rover.position}", end = '')
-                print(f", energy: {(100 * rover.energy / MAX_ROVER_CHARGE):.1f}%", end = '')
-                print(f", distance left: {rover.calculate_distance(rover.position, rover.goal)}{RESET}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[%s] %s... current position: %s, energy: %.1f%%, distance left: %s", rover.name, rover.status, rover.position, 100 * rover.energy / MAX_ROVER_CHARGE, rover.calculate_distance(rover.position, rover.goal))
 
                 if not arrived_next_step or rover.curr < s_path - 1:
                     return
@@ -517,15 +562,11 @@ class Rover(VisualizationMixin, Agent):
                 if rover.status == "moving":
                     rover.status = "arrived"
 
-                    print(f"{CYAN}[{rover.name}] arrived at mission goal {rover.goal}{RESET}")
+                    logger.info("[%s] arrived at mission goal %s", rover.name, rover.goal)
                     await rover.viz_send_message(f"arrived at target location {rover.goal}")
                     await rover.viz_update_status(rover.status)
 
-                    msg = Message(
-                        to=rover.base_jid,
-                        metadata={"performative": "inform", "type": "mission_complete"},
-                        body=str({"position": rover.position})
-                    )
+                    msg = make_message(rover.base_jid, _MISSION_COMPLETE_META, encode({"position": rover.position}))
                     await self.send(msg)
 
                     rover.add_behaviour(rover.AnalyzeSoil())
@@ -533,11 +574,16 @@ class Rover(VisualizationMixin, Agent):
                     rover.goal = rover.base_position
                     old_path = rover.path[::-1]
 
-                    _ = await rover.find_path()
-                    if not rover.path:
-                        print("Using old path to return to base")
+                    # With unchanged cell costs the reversed outbound path is an optimal way back
+                    if rover._path_map_version == rover.map.version:
+                        logger.debug("[%s] Map unchanged, retracing outbound path to base", rover.name)
                         rover.path = old_path
-                        rover.goal = rover.base_position
+                    else:
+                        _ = await rover.find_path()
+                        if not rover.path:
+                            logger.info("[%s] Using old path to return to base", rover.name)
+                            rover.path = old_path
+                            rover.goal = rover.base_position
 
                     rover.status = "returning"
                     self.kill()
@@ -548,16 +594,13 @@ class Rover(VisualizationMixin, Agent):
                     rover.path = []
                     rover.goal = None
                     rover.is_on_base = True
+                    rover._docked.set()
 
-                    print(f"{CYAN}[{rover.name}] returned to base successfully at {rover.position}{RESET}")
+                    logger.info("[%s] returned to base successfully at %s", rover.name, rover.position)
                     await rover.viz_send_message(f"successfully returned to base")
                     await rover.viz_update_status(rover.status)
 
-                    msg = Message(
-                        to=rover.base_jid,
-                        metadata={"performative": "inform", "type": "rover_returned_to_base"},
-                        body=str({"position": rover.position})
-                    )
+                    msg = make_message(rover.base_jid, _RETURNED_META, encode({"position": rover.position}))
 
                     await self.send(msg)
                     self.kill()
@@ -565,7 +608,7 @@ class Rover(VisualizationMixin, Agent):
     # -------------------------------------------------------------------------
     # NEW BEHAVIOUR — ANALYZE SOIL
     # -------------------------------------------------------------------------
-    class AnalyzeSoil(CyclicBehaviour):
+    class AnalyzeSoil(OneShotBehaviour):
         """
         Behaviour that simulates a one-time soil/resource analysis at the rover's
         current location. It samples from defined probabilities and informs the
@@ -574,32 +617,22 @@ class Rover(VisualizationMixin, Agent):
         async def run(self):
             """
             Execute resource sampling based on resource_probs. Sends an inform
-            message to the base containing any discovered resources and then
-            terminates the behaviour.
+            message to the base containing any discovered resources; the
+            behaviour ends after this single run.
             """
             rover = self.agent
-            found_resources = []
-
-            for resource, prob in rover.resource_probs.items():
-                if random.random() < prob:
-                    found_resources.append(resource)
+            draw = random.random
+            found_resources = [resource for resource, prob in rover.resource_probs if draw() < prob]
 
             if found_resources:
-                msg = Message(
-                    to=rover.base_jid,
-                    metadata={"performative": "inform", "type": "resources_found"},
-                    body=str({"position": rover.position, "resources": found_resources})
-                )
+                msg = make_message(rover.base_jid, _RESOURCES_META, encode({"position": rover.position, "resources": found_resources}))
                 await self.send(msg)
-                print(f"{CYAN}[{rover.name}] Resources found at {rover.position}: {found_resources}{RESET}")
+                logger.info("[%s] Resources found at %s: %s", rover.name, rover.position, found_resources)
                 await rover.viz_send_message(f"Resources discovered: {', '.join(found_resources)}")
             else:
-                print(f"{CYAN}[{rover.name}] No resources found at {rover.position}.{RESET}")
+                logger.info("[%s] No resources found at %s.", rover.name, rover.position)
                 await rover.viz_send_message(f"Soil analysis complete - no resources found")
 
-            self.kill()  # one-time analysis
-            await asyncio.sleep(1)
-
     # -------------------------------------------------------------------------
     # SETUP
     # -------------------------------------------------------------------------
@@ -610,12 +643,12 @@ class Rover(VisualizationMixin, Agent):
 
         This method is called by the SPADE framework when the agent starts.
         """
-        print(f"{CYAN}Initializing [{self.name}] rover.{RESET}")
+        logger.info("Initializing [%s] rover.", self.name)
         self.add_behaviour(self.ReceiveMessages())
         self.add_behaviour(self.Charge())
 
-        if hasattr(self, "viz_server"):
+        if self.viz_server is not None:
             self.add_behaviour(VisualizationBehaviour())
 
-        print(f"{CYAN}[{self.name}] Rover initialized at {self.position}, waiting for path.{RESET}")
+        logger.info("[%s] Rover initialized at %s, waiting for path.", self.name, self.position)
         await self.viz_send_message(f"Rover initialized at {self.position}")
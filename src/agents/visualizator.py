@@ -11,7 +11,10 @@ class VisualizationMixin:
 
     Stores tracked attributes (position, battery, status, etc.) and provides
     helper methods to send structured updates to the visualization server.
+    Every helper is a no-op while no server is attached.
     """
+    viz_server = None
+
     def setup_visualization(self, viz_server, agent_type: str, agent_jid: str, position: Tuple[float, float], battery: float = 100.0, color: Optional[str] = None, radius: int = 5):
         """
         Initialize visualization properties for the agent.
@@ -27,6 +30,7 @@ class VisualizationMixin:
         """
         self.viz_server = viz_server
         self.agent_jid = agent_jid
+        self.viz_agent_id = agent_jid.split("@")[0]
         self.viz_agent_type = agent_type
         self.viz_color = color
         self.viz_radius = radius
@@ -48,9 +52,9 @@ class VisualizationMixin:
 
     async def viz_send_update(self):
         """Push the agent's complete state update to the server."""
-        if hasattr(self, 'viz_server') and self.viz_server:
+        if self.viz_server is not None:
             await self.viz_server.send_agent_update(
-                agent_id=self.agent_jid.split("@")[0],
+                agent_id=self.viz_agent_id,
                 agent_type=self.viz_agent_type,
                 x=self.viz_position[0],
                 y=self.viz_position[1],
@@ -62,32 +66,32 @@ class VisualizationMixin:
 
     async def viz_report_resource(self, resource_id: str, x: float, y: float):
         """Report a discovered resource to the visualization layer."""
-        if hasattr(self, 'viz_server') and self.viz_server:
+        if self.viz_server is not None:
             await self.viz_server.send_resource_discovered(resource_id, float(x), float(y))
             await self.viz_server.send_message(
-                sender=self.agent_jid.split("@")[0],
+                sender=self.viz_agent_id,
                 content=f"Discovered {resource_id} at ({x:.1f}, {y:.1f})"
             )
 
     async def viz_report_hazard(self, hazard_id: str, x: float, y: float, radius: float = 5):
         """Report a detected hazard at a location."""
-        if hasattr(self, 'viz_server') and self.viz_server:
+        if self.viz_server is not None:
             await self.viz_server.send_hazard_detected(hazard_id, float(x), float(y), float(radius))
             await self.viz_server.send_message(
-                sender=self.agent_jid.split("@")[0],
+                sender=self.viz_agent_id,
                 content=f"Hazard detected: {hazard_id} at ({x:.1f}, {y:.1f})"
             )
 
     async def viz_mark_explored(self, x: float, y: float):
         """Mark a cell as explored visually."""
-        if hasattr(self, 'viz_server') and self.viz_server:
+        if self.viz_server is not None:
             await self.viz_server.send_cell_explored(int(x), int(y))
 
     async def viz_send_message(self, content: str):
         """Send a log message to visualization."""
-        if hasattr(self, 'viz_server') and self.viz_server:
+        if self.viz_server is not None:
             await self.viz_server.send_message(
-                sender=self.agent_jid.split("@")[0],
+                sender=self.viz_agent_id,
                 content=content
             )
 
@@ -95,6 +99,5 @@ class VisualizationBehaviour(CyclicBehaviour):
     """Behaviour that periodically sends visualization updates."""
 
     async def run(self):
-        if hasattr(self.agent, 'viz_server'):
-            await self.agent.viz_send_update()
+        await self.agent.viz_send_update()
         await asyncio.sleep(0.1)
@@ -4,6 +4,12 @@ import spade
 import logging
 import json
 import sys
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from typing import Tuple, List, Dict, Any
 
 from world.world import World, WorldObject
@@ -15,6 +21,8 @@ from server import VisualizationServer, setup_logging, load_config, generate_wor
 
 from settings import *
 
+logger = logging.getLogger(__name__)
+
 async def main():
     """
     Main entry point for the multi-agent system simulation.
@@ -22,28 +30,32 @@ async def main():
     This version ONLY starts the visualization server and waits indefinitely.
     The simulation is started on-demand via WebSocket commands from the frontend.
     """
-    print("[MAIN] Multi-Agent System Visualization Server")
-    print("[MAIN] Starting WebSocket server...")
+    # Route startup output through the queued handler; a simulation's config re-applies the levels
+    setup_logging({})
+    logger.info("[MAIN] Multi-Agent System Visualization Server")
+    logger.info("[MAIN] Starting WebSocket server...")
     
     # --- CREATE VISUALIZATION SERVER (without world_map initially) ---
     viz_server = VisualizationServer()
     runner = await viz_server.start_server()
 
-    print("[MAIN] Visualization server READY on ws://localhost:8080/ws")
-    print("[MAIN] Waiting for client connection and simulation commands...")
-    print("[MAIN] Use the web interface to start a simulation with a config file.")
+    logger.info("[MAIN] Visualization server READY on ws://localhost:8080/ws")
+    logger.info("[MAIN] Waiting for client connection and simulation commands...")
+    logger.info("[MAIN] Use the web interface to start a simulation with a config file.")
     
     # Keep the server running indefinitely
     try:
         while True:
             await asyncio.sleep(1)
     except KeyboardInterrupt:
-        print("\n[MAIN] Shutting down server...")
+        logger.info("[MAIN] Shutting down server...")
         await runner.cleanup()
-        print("[MAIN] Server stopped.")
+        logger.info("[MAIN] Server stopped.")
 
 if __name__ == "__main__":
     """
     Run the visualization server that can start simulations on demand.
     """
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     spade.run(main())
@@ -1,7 +1,10 @@
 import asyncio
+import atexit
 import json
 import aiohttp
 import logging
+import logging.handlers
+import queue
 import sys
 import random
 
@@ -21,6 +24,28 @@ from agents.rover import Rover
 
 from settings import *
 
+logger = logging.getLogger(__name__)
+
+class AgentColorFormatter(logging.Formatter):
+    """
+    Formatter that colors agent log lines the same way the agents used to
+    color their console output.
+    """
+
+    COLORS: Dict[str, str] = {
+        "agents.base": MAGENTA,
+        "agents.drone": GREEN,
+        "agents.rover": CYAN,
+        "world.map": YELLOW,
+    }
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        color = self.COLORS.get(record.name)
+        return f"{color}{message}{RESET}" if color else message
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
 def setup_logging(config: Dict[str, Any]):
     """
     Configure logging based on the configuration dictionary.
@@ -28,10 +53,22 @@ def setup_logging(config: Dict[str, Any]):
     Args:
         config (Dict[str, Any]): Configuration dictionary containing logging settings.
     """
+    global _log_listener
+
     log_config = config.get("logging", {})
     
     base_level = log_config.get("base_level", "INFO")
-    logging.basicConfig(level=getattr(logging, base_level))
+    if _log_listener is None:
+        # Agents only enqueue records; formatting and the blocking terminal
+        # write happen on the listener thread, away from the event loop.
+        log_queue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(AgentColorFormatter())
+        _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+    logging.getLogger().setLevel(getattr(logging, base_level))
     
     xmpp_level = log_config.get("spade_xmpp_level", "DEBUG")
     logging.getLogger("spade.xmpp").setLevel(getattr(logging, xmpp_level))
@@ -55,13 +92,13 @@ def load_config(config_path: str) -> Dict[str, Any]:
     try:
         with open(config_path, 'r') as f:
             config = json.load(f)
-        print(f"[CONFIG] Loaded configuration from: {config_path}")
+        logger.info("[CONFIG] Loaded configuration from: %s", config_path)
         return config
     except FileNotFoundError:
-        print(f"[ERROR] Configuration file not found: {config_path}")
+        logger.error("[CONFIG] Configuration file not found: %s", config_path)
         raise
     except json.JSONDecodeError as e:
-        print(f"[ERROR] Invalid JSON in configuration file: {e}")
+        logger.error("[CONFIG] Invalid JSON in configuration file: %s", e)
         raise
 
 def random_pos_in_base(world: World, base_name: str, base_centers: Dict[str, Tuple[float, float]], base_radii: Dict[str, float]):
@@ -78,7 +115,7 @@ def random_pos_in_base(world: World, base_name: str, base_centers: Dict[str, Tup
         Tuple[float, float]: Random collision-free coordinates within the base.
     """
     if base_name not in base_centers:
-        print(f"[WARNING] Base '{base_name}' not found, using default position")
+        logger.warning("[WORLD] Base '%s' not found, using default position", base_name)
         return (100, 100)
     
     base_center = base_centers[base_name]
@@ -88,10 +125,10 @@ def random_pos_in_base(world: World, base_name: str, base_centers: Dict[str, Tup
     for _ in range(max_attempts):
         x = random.uniform(base_center[0] - 0.15 * base_radius, base_center[0] + 0.15 * base_radius)
         y = random.uniform(base_center[1] - 0.15 * base_radius, base_center[1] + 0.15 * base_radius)
-        if all(((x - o.pos[0]) ** 2 + (y - o.pos[1]) ** 2) ** 0.5 > COLLISION_RADIUS for o in world.objects):
+        if not world.collides(None, (x, y)):
             return (x, y)
     
-    print("[WARNING] Could not find collision-free position, using fallback")
+    logger.warning("[WORLD] Could not find collision-free position, using fallback")
     return (base_center[0], base_center[1])
 
 def generate_world(config: Dict[str, Any], tag: str) -> Tuple[World, Map, Dict[str, Tuple[float, float]], List[Tuple[float, float]]]:
@@ -131,7 +168,7 @@ def generate_world(config: Dict[str, Any], tag: str) -> Tuple[World, Map, Dict[s
         
         base_centers[base_name] = base_center
         base_radii[base_name] = base_radius
-        world.objects.append(WorldObject(f"{base_config['jid']}@{tag}", base_center))
+        world.add_object(WorldObject(f"{base_config['jid']}@{tag}", base_center))
         
     # --- Process rover positions ---
     rover_positions = []
@@ -149,7 +186,7 @@ def generate_world(config: Dict[str, Any], tag: str) -> Tuple[World, Map, Dict[s
     # --- Register rover world objects ---
     for i, (rover_config, pos) in enumerate(zip(rover_configs, rover_positions), start=1):
         rover_name = rover_config.get("name", f"rover{i}")
-        world.objects.append(WorldObject(f"{rover_config['jid']}@{tag}", pos))
+        world.add_object(WorldObject(f"{rover_config['jid']}@{tag}", pos))
     
     # --- Process drone positions ---
     drone_positions = []
@@ -157,7 +194,7 @@ def generate_world(config: Dict[str, Any], tag: str) -> Tuple[World, Map, Dict[s
         pos = tuple(drone_config.get("position", [500, 500]))
         drone_positions.append(pos)
         drone_name = drone_config.get("name", drone_config["jid"])
-        world.objects.append(WorldObject(f"{drone_config['jid']}@{tag}", pos))
+        world.add_object(WorldObject(f"{drone_config['jid']}@{tag}", pos))
     
     return world, world_map, base_centers, rover_positions, drone_positions
 
@@ -170,75 +207,76 @@ async def simulate_hazards(world_map: Map, viz_server: Any, interval: int = 10):
         viz_server (Any): Visualization server to push updates.
         interval (int, optional): Time in seconds between hazard checks. Defaults to 10.
     """
-    async def clear_storm(world_map: Map):
+    def apply_storm(world_map: Map, center: Optional[Tuple[int, int]] = None, radius: int = 0) -> List[Dict[str, Any]]:
         """
-        Clears any active dust storms on the map and sends updates to visualization.
+        Set every cell's dust state for a new storm, or clear it, in a single pass.
 
         Args:
             world_map (Map): The map object.
+            center (Optional[Tuple[int, int]]): Storm center, or None to clear all storms.
+            radius (int): Storm radius in cells.
+
+        Returns:
+            List[Dict[str, Any]]: Serialized cells in the visualized area, after the update.
         """
-        logging.info("[HAZARD] clearing for new storm...")
+        flat_map  = []
+        max_viz_x = min(world_map.columns, 100)
+        max_viz_y = min(world_map.rows, 100)
+        radius_sq = radius ** 2
+
         for i in range(world_map.columns):
             for j in range(world_map.rows):
-                cell = world_map.get_cell(i, j)
-                if cell.dust_storm:
+                in_storm = center is not None and (i - center[0]) ** 2 + (j - center[1]) ** 2 < radius_sq
+                if in_storm:
+                    world_map.make_dust_cell(i, j)
+                else:
                     world_map.clear_dust_cell(i, j)
+                if i < max_viz_x and j < max_viz_y:
+                    flat_map.append(world_map.grid[i][j].to_dict())
 
-        flat_map  = [] 
-        max_viz_x = min(world_map.columns, 100)
-        max_viz_y = min(world_map.rows, 100)
-        
-        for x in range(max_viz_x):
-            for y in range(max_viz_y):
-                cell = world_map.grid[x][y]
-                flat_map.append(cell.to_dict())
-                
-        await viz_server.send_map_updates(flat_map)
+        return flat_map
+
+    async def clear_storm(world_map: Map):
+        """
+        Clears any active dust storms on the map and sends updates to visualization.
+
+        Args:
+            world_map (Map): The map object.
+        """
+        logger.info("[HAZARD] clearing for new storm...")
+        await viz_server.send_map_updates(apply_storm(world_map))
 
     while True:
         try:
             await asyncio.sleep(interval // 6)
         except asyncio.CancelledError:
-            logging.info("[HAZARD] Task cancelled, clearing storm...")
+            logger.info("[HAZARD] Task cancelled, clearing storm...")
             await clear_storm(world_map)
             raise
         
-        logging.info("[HAZARD] Checking for new storm...")
-        await clear_storm(world_map)
-        logging.info("[HAZARD] Previous storm subsided. Map cells reset.")
+        logger.debug("[HAZARD] Checking for new storm...")
         
         if random.random() < STORM_CHANCE: 
             center_x = random.randint(0, world_map.columns - 1)
             center_y = random.randint(0, world_map.rows - 1)
             radius = random.randint(int(0.15 * world_map.columns), int(0.40 * world_map.columns))
 
-            logging.warning(f"[HAZARD] New dust storm forming at ({center_x}, {center_y}) with radius {radius}.")
-
-            for i in range(world_map.columns):
-                for j in range(world_map.rows):
-                    cell = world_map.get_cell(i, j)
-                    dist = ((cell.x - center_x) ** 2 + (cell.y - center_y) ** 2) ** 0.5
-                    if dist < radius:
-                        world_map.make_dust_cell(i,j)
-
-            flat_map = [] 
-            max_viz_x = min(world_map.columns, 100)
-            max_viz_y = min(world_map.rows, 100)
-            
-            for x in range(max_viz_x):
-                for y in range(max_viz_y):
-                    cell = world_map.grid[x][y]
-                    flat_map.append(cell.to_dict())
+            # Clearing the previous storm and laying the new one happen in the same pass
+            flat_map = apply_storm(world_map, (center_x, center_y), radius)
+            logger.warning("[HAZARD] Dust storm moved to (%s, %s) with radius %s.", center_x, center_y, radius)
 
-            print(f"Any cell with dust? {any(cell['dust_storm'] for cell in flat_map)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[HAZARD] Any cell with dust? %s", any(cell['dust_storm'] for cell in flat_map))
             await viz_server.send_map_updates(flat_map)
             await viz_server.send_hazard_detected("dust_storm", center_x, center_y, radius)
-            logging.warning(f"[HAZARD] Map updated.")
+            logger.info("[HAZARD] Map updated.")
 
             await asyncio.sleep(interval)
         
         else:
-            logging.info("[HAZARD] All clear. No new storm detected.")
+            await clear_storm(world_map)
+            logger.info("[HAZARD] Previous storm subsided. Map cells reset.")
+            logger.info("[HAZARD] All clear. No new storm detected.")
 
 class VisualizationServer:
     """
@@ -268,6 +306,7 @@ class VisualizationServer:
             "missionTime": 0,
             "hazards": 0
         }
+        self.stats_flush: Optional[asyncio.Task] = None
         
         # Track simulation state
         self.simulation_running = False
@@ -292,7 +331,7 @@ class VisualizationServer:
 
         self.clients.add(ws)
         self.client_connected.set()
-        print(f"Client connected. Total clients: {len(self.clients)}")
+        logger.info("[WEBSOCKET] Client connected. Total clients: %d", len(self.clients))
 
         # Send initial map if available
         if self.map_data:
@@ -304,10 +343,10 @@ class VisualizationServer:
                     data = json.loads(msg.data)
                     await self.handle_command(data)
                 elif msg.type == aiohttp.WSMsgType.ERROR:
-                    print(f'WebSocket error: {ws.exception()}')
+                    logger.error("[WEBSOCKET] WebSocket error: %s", ws.exception())
         finally:
             self.clients.discard(ws)
-            print(f"Client disconnected. Total clients: {len(self.clients)}")
+            logger.info("[WEBSOCKET] Client disconnected. Total clients: %d", len(self.clients))
             if not self.clients:
                 self.client_connected.clear()
         return ws
@@ -319,7 +358,7 @@ class VisualizationServer:
         Args:
             data (Dict[str, Any]): Parsed JSON payload sent by the frontend.
         """
-        print(f"Received command: {data}")
+        logger.debug("[WEBSOCKET] Received command: %s", data)
 
         cmd_type = data.get("type")
         
@@ -498,7 +537,7 @@ class VisualizationServer:
                     await self.pause_event.wait()  # Wait if paused
                     await asyncio.sleep(1)  # Check every second
             except asyncio.CancelledError:
-                logging.info("[SIMULATION] Cancel received, stopping simulation immediately.")
+                logger.info("[SIMULATION] Cancel received, stopping simulation immediately.")
                 raise  # propagate so the finally block handles cleanup
 
 
@@ -516,7 +555,7 @@ class VisualizationServer:
             await self.send_message("server", f"[ERROR] Config file not found: {config_path}")
             await self.broadcast({"type": "error", "message": f"Config file not found: {config_path}"})
         except Exception as e:
-            logging.exception("Error during simulation")
+            logger.exception("[SIMULATION] Error during simulation")
             await self.send_message("server", f"[ERROR] Simulation failed: {str(e)}")
             await self.broadcast({"type": "error", "message": str(e)})
         finally:
@@ -532,7 +571,7 @@ class VisualizationServer:
                 try:
                     await agent.stop()
                 except Exception as e:
-                    logging.error(f"Error stopping agent: {e}")
+                    logger.error("[SIMULATION] Error stopping agent: %s", e)
             
             self.simulation_running = False
             self.simulation_paused = False
@@ -554,6 +593,21 @@ class VisualizationServer:
             return_exceptions=True
         )
 
+    def schedule_stats(self) -> None:
+        """
+        Queue a stats broadcast, coalescing every request made within
+        STATS_FLUSH_INTERVAL into a single message.
+        """
+        if self.stats_flush is None or self.stats_flush.done():
+            self.stats_flush = asyncio.ensure_future(self.flush_stats())
+
+    async def flush_stats(self) -> None:
+        """Wait out the coalescing window, then refresh and send the stats."""
+        await asyncio.sleep(STATS_FLUSH_INTERVAL)
+        if self.rovers_energy:
+            self.stats["totalEnergy"] = sum(self.rovers_energy.values()) / len(self.rovers_energy)
+        await self.send_stats()
+
     async def send_stats(self) -> None:
         """Send current statistics to all clients."""
         if not self.clients:
@@ -583,7 +637,7 @@ class VisualizationServer:
         await runner.setup()
         site = web.TCPSite(runner, host, port)
         await site.start()
-        print(f"WebSocket server started on ws://{host}:{port}/ws")
+        logger.info("[WEBSOCKET] WebSocket server started on ws://%s:%s/ws", host, port)
         return runner
 
     async def wait_for_client(self, timeout=None):
@@ -598,10 +652,10 @@ class VisualizationServer:
         """
         try:
             await asyncio.wait_for(self.client_connected.wait(), timeout=timeout)
-            print("[WEBSOCKET] Client connection established")
+            logger.info("[WEBSOCKET] Client connection established")
             return True
         except asyncio.TimeoutError:
-            print("[WEBSOCKET] Timeout waiting for client connection")
+            logger.warning("[WEBSOCKET] Timeout waiting for client connection")
             return False
 
     def initialize_map(self, world_map: Map):
@@ -622,7 +676,7 @@ class VisualizationServer:
                 flat_map.append(cell.to_dict())
 
         self.map_data = flat_map
-        print(f"Server map data initialized from simulation world: {len(flat_map)} cells.")
+        logger.info("[MAP] Server map data initialized from simulation world: %d cells.", len(flat_map))
 
     async def send_full_map(self, ws):
         """
@@ -664,7 +718,6 @@ class VisualizationServer:
     async def send_agent_update(self, agent_id: str, agent_type: str, x: float, y: float, battery: float, status: str, color: Optional[str], radius: int):
         """Broadcast agent state information to all clients."""
         self.rovers_energy[agent_id] = battery
-        self.stats["totalEnergy"] = sum(value for _, value in self.rovers_energy.items()) / len(self.rovers_energy)
 
         await self.broadcast({
             "type": "agent_update",
@@ -679,14 +732,12 @@ class VisualizationServer:
                 "radius": radius
             }
         })
-        await self.send_stats()
+        self.schedule_stats()
 
     async def send_resource_discovered(self, resource_id: str, x: float, y: float):
         """Notify clients of a newly discovered resource."""
-        if resource_id not in self.stats["resourcesFound"].keys():
-            self.stats["resourcesFound"][resource_id] = 1
-        else:
-            self.stats["resourcesFound"][resource_id] += 1
+        resources_found = self.stats["resourcesFound"]
+        resources_found[resource_id] = resources_found.get(resource_id, 0) + 1
 
         await self.broadcast({
             "type": "resource_discovered",
@@ -696,7 +747,7 @@ class VisualizationServer:
                 "y": y
             }
         })
-        await self.send_stats()
+        self.schedule_stats()
 
     async def send_hazard_detected(self, hazard_id: str, x: float, y: float, radius: float):
         """Notify clients of a detected hazard."""
@@ -710,7 +761,7 @@ class VisualizationServer:
             }
         })
         self.stats["hazards"] += 1
-        await self.send_stats()
+        self.schedule_stats()
 
     async def send_cell_explored(self, x: float, y: float):
         """Mark a grid cell as explored in visualization."""
@@ -720,7 +771,7 @@ class VisualizationServer:
             "x": x,
             "y": y
         })
-        await self.send_stats()
+        self.schedule_stats()
 
     async def send_message(self, sender: str, content: str):
         """Send a log/communication message to all visualization clients."""
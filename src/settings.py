@@ -9,6 +9,12 @@ TAG = "localhost"
 SIMULATION_SPEED = 3
 STORM_COST = 100
 INTERVAL_FOR_STORMS = 10 # in secs
+PATH_COST_CACHE_SIZE = 1024
+ASTAR_CACHE_SIZE = 256
+HEURISTIC_CACHE_SIZE = 32
+CFP_MIN_TIMEOUT = 0.5 # in secs
+CFP_MAX_TIMEOUT = 4.0 # in secs
+STATS_FLUSH_INTERVAL = 0.2 # in secs
 
 BLACK = '\033[30m'
 RED = '\033[31m'
@@ -1,14 +1,27 @@
+import logging
 import random
-from heapq import heapify, heappop, heappush
-from collections import defaultdict
+from heapq import heappop, heappush
+from collections import OrderedDict
+from itertools import count
 from math import sqrt
 from typing import Tuple, List, Optional
 
 from .world import WorldObject
-from settings import STORM_COST, RED, GREEN, MAGENTA, YELLOW, RESET
+from settings import STORM_COST, ASTAR_CACHE_SIZE, HEURISTIC_CACHE_SIZE, RED, GREEN, MAGENTA, YELLOW, RESET
+
+logger = logging.getLogger(__name__)
 
 MapPos = Tuple[int, int]
 
+_INF = float('inf')
+
+# The 8 grid moves with their Euclidean step length, in the order A* expands them
+_NEIGHBOUR_STEPS: Tuple[Tuple[int, int, float], ...] = tuple(
+    (dx, dy, sqrt(dx ** 2 + dy ** 2))
+    for dx, dy in [(-1, -1), (0, -1), (1, -1), (1, 0),
+                   (1, 1), (0, 1), (-1, 1), (-1, 0)]
+)
+
 class MapCell:
     """
     Represents a single cell in the map grid.
@@ -20,6 +33,9 @@ class MapCell:
         x (int): X-coordinate in the grid.
         y (int): Y-coordinate in the grid.
     """
+    # One instance per grid cell, so skip the per-instance __dict__
+    __slots__ = ("terrain", "cost", "dust_storm", "x", "y")
+
     def __init__(self, pos: MapPos, terrain: float):
         """
         Initialize a MapCell.
@@ -70,6 +86,9 @@ class Map:
         grid (List[List[MapCell]]): 2D list of MapCells.
         graph (int): Bitmask representing obstacle positions.
         visited (int): Bitmask representing visited positions.
+        version (int): Bumped whenever a cell's traversal cost changes.
+        path_cache (OrderedDict): Recent A* results keyed by (version, start cell, goal cell).
+        heuristic_cache (OrderedDict): Per-goal A* heuristic tables, shared by all searches.
     """
     def __init__(self, limit: Tuple[float, float]) -> None:
         """
@@ -80,6 +99,9 @@ class Map:
         """
         self.graph: int = 0
         self.visited: int = 0
+        self.version: int = 0
+        self.path_cache: OrderedDict[Tuple[int, MapPos, MapPos], Tuple[Tuple[float, float], ...]] = OrderedDict()
+        self.heuristic_cache: OrderedDict[MapPos, List[float]] = OrderedDict()
         self.rows: int = int(limit[0])
         self.columns: int = int(limit[1])
         self.length: float = limit[0]
@@ -230,6 +252,29 @@ class Map:
                 count += self.is_visited((i, j))
         return count
 
+    def heuristic_table(self, goal: MapPos) -> List[float]:
+        """
+        Get the shared A* heuristic table for a goal cell.
+
+        The table is indexed by x * rows + y and holds -1 for cells whose
+        heuristic has not been computed yet. At most HEURISTIC_CACHE_SIZE
+        goals are kept, evicting the least recently used.
+
+        Args:
+            goal (MapPos): Goal cell.
+
+        Returns:
+            List[float]: The goal's heuristic table.
+        """
+        table = self.heuristic_cache.get(goal)
+        if table is None:
+            table = self.heuristic_cache[goal] = [-1.0] * (self.rows * self.columns)
+            if len(self.heuristic_cache) > HEURISTIC_CACHE_SIZE:
+                self.heuristic_cache.popitem(last=False)
+        else:
+            self.heuristic_cache.move_to_end(goal)
+        return table
+
     def get_cell(self, x: int, y: int) -> Optional[MapCell]:
         """
         Access a cell at given coordinates.
@@ -253,8 +298,9 @@ class Map:
             x (int): X-coordinate.
             y (int): Y-coordinate.
         """
-        if self.in_map((x, y)):
+        if self.in_map((x, y)) and not self.grid[x][y].dust_storm:
             self.grid[x][y].dust_storm = True
+            self.version += 1
 
     def clear_dust_cell(self, x: int, y: int):
         """
@@ -264,8 +310,9 @@ class Map:
             x (int): X-coordinate.
             y (int): Y-coordinate.
         """
-        if self.in_map((x, y)):
+        if self.in_map((x, y)) and self.grid[x][y].dust_storm:
             self.grid[x][y].dust_storm = False
+            self.version += 1
 
     def print(self, start: Optional[MapPos], goal: Optional[MapPos]) -> None:
         """
@@ -290,79 +337,35 @@ class Map:
             print(row + RESET)
 
 
-class AStarNode:
-    """
-    Node used in the A* algorithm priority queue.
-
-    Attributes:
-        pos (MapPos): Grid position of the node.
-        score (float): Current fScore of the node.
-    """
-    def __init__(self, pos: MapPos, score: float) -> None:
-        """
-        Initialize an AStarNode.
-
-        Args:
-            pos (MapPos): Grid coordinates.
-            score (float): fScore of the node.
-        """
-        self.pos = pos
-        self.score = score
-
-    def __lt__(self, other) -> bool:
-        """
-        Compare nodes for priority queue.
-
-        Args:
-            other (AStarNode): Another node to compare.
-
-        Returns:
-            bool: True if self has lower score.
-        """
-        return self.score < other.score
-
-
 class AStar:
     """Static class implementing the A* pathfinding algorithm."""
 
     @staticmethod
-    def _reconstruct(map: Map, path: dict[MapPos, MapPos], start: MapPos, goal: MapPos) -> List[Tuple[float, float]]:
+    def _reconstruct(map: Map, path: List[int], start: int, goal: int) -> List[Tuple[float, float]]:
         """
         Reconstruct the path from start to goal.
 
         Args:
             map (Map): The map object.
-            path (dict): Parent pointers for each node.
-            start (MapPos): Start node.
-            goal (MapPos): Goal node.
+            path (List[int]): Parent cell index for each cell index.
+            start (int): Start cell index.
+            goal (int): Goal cell index.
 
         Returns:
             List[Tuple[float, float]]: List of physical coordinates representing the path.
         """
-        node: MapPos = goal
-        seq: List[MapPos] = []
+        rows: int = map.rows
+        node: int = goal
+        seq: List[Tuple[float, float]] = []
 
+        # Walk back from the goal appending, then flip once instead of inserting at the front
         while node != start:
-            seq.insert(0, map.rescale(node))
+            seq.append(map.rescale(divmod(node, rows)))
             node = path[node]
 
+        seq.reverse()
         return seq
 
-    @staticmethod
-    def _gScore(map: Map, curr: MapPos, neighbour: MapPos) -> float:
-        """
-        Compute the cost to move from curr to neighbour.
-
-        Args:
-            map (Map): Map object.
-            curr (MapPos): Current node.
-            neighbour (MapPos): Neighbour node.
-
-        Returns:
-            float: Movement cost.
-        """
-        return map.distance(curr, neighbour) + map.grid[neighbour[0]][neighbour[1]].get_cost()
-
     @staticmethod
     def _heuristicScore(map: Map, curr: MapPos, goal: MapPos) -> float:
         """
@@ -391,52 +394,103 @@ class AStar:
         Returns:
             List[Tuple[float, float]]: List of physical coordinates representing the path.
         """
-        print(f"{YELLOW}AStar[STARTING]: start = {start}, goal = {goal}{RESET}")
+        logger.debug("AStar[STARTING]: start = %s, goal = %s", start, goal)
 
         s: MapPos = map.normalize(start)
         g: MapPos = map.normalize(goal)
+        if not map.in_map(g):
+            logger.debug("AStar[FINISHING]: did not find path")
+            return []
+        # Searches index cells as x * rows + y, so the start must lie on the grid
+        s = (min(max(s[0], 0), map.columns - 1), min(max(s[1], 0), map.rows - 1))
+
+        # Paths depend only on the start/goal cells and the cell costs, which bump map.version
+        key = (map.version, s, g)
+        cached = map.path_cache.get(key)
+        if cached is not None:
+            map.path_cache.move_to_end(key)
+            logger.debug("AStar[FINISHING]: reusing cached path")
+            return list(cached)
+
+        path = AStar._search(map, s, g)
+        map.path_cache[key] = tuple(path)
+        if len(map.path_cache) > ASTAR_CACHE_SIZE:
+            map.path_cache.popitem(last=False)
+        return path
 
-        min_heap: List[AStarNode] = []
-        heapify(min_heap)
-
-        path: dict[MapPos, MapPos] = {}
-        gScore: dict[MapPos, float] = defaultdict(lambda: float('inf'))
-        gScore[s] = 0
-        heappush(min_heap, AStarNode(s, gScore[s]))
+    @staticmethod
+    def _search(map: Map, s: MapPos, g: MapPos) -> List[Tuple[float, float]]:
+        """
+        Search the grid for a cheapest path between two cells.
 
-        fScore: dict[MapPos, float] = defaultdict(lambda: float('inf'))
-        fScore[s] = AStar._heuristicScore(map, s, g)
+        Args:
+            map (Map): Map object.
+            s (MapPos): Start cell, on the grid.
+            g (MapPos): Goal cell, on the grid.
 
-        count: int = 0
+        Returns:
+            List[Tuple[float, float]]: List of physical coordinates representing the path.
+        """
+        # Dense per-query tables indexed by cell, replacing tuple-keyed dicts
+        rows: int = map.rows
+        columns: int = map.columns
+        grid: List[List[MapCell]] = map.grid
+        cells: int = rows * columns
+        s_idx: int = s[0] * rows + s[1]
+        g_idx: int = g[0] * rows + g[1]
+
+        path: List[int] = [-1] * cells
+        gScore: List[float] = [_INF] * cells
+        gScore[s_idx] = 0
+
+        # Entries are (fScore, push order, cell); ties pop first-in first-out.
+        # A single-entry list is already a valid heap.
+        counter = count()
+        min_heap: List[Tuple[float, int, int]] = [(gScore[s_idx], next(counter), s_idx)]
+
+        # Heuristic values depend only on the goal and the grid geometry, so the table is shared
+        # with every later search towards the same goal; cells are filled in on first use
+        hScore: List[float] = map.heuristic_table(g)
+
+        def h(idx: int, pos: MapPos) -> float:
+            score = hScore[idx]
+            if score < 0:
+                score = hScore[idx] = AStar._heuristicScore(map, pos, g)
+            return score
+
+        # Closed set local to this query; stale heap entries for expanded cells are skipped on pop
+        closed: bytearray = bytearray(cells)
+        expanded: int = 0
         while min_heap:
-            curr: MapPos = heappop(min_heap).pos
-            if map.is_visited(curr):
+            curr: int = heappop(min_heap)[2]
+            if closed[curr]:
                 continue
-            map.visit(curr)
-            count += 1
-
-            if curr == g:
-                print(f"{YELLOW}AStar[FINISHING]: reconstructing path{RESET}")
-                map.clear_visited()
-                return AStar._reconstruct(map, path, s, g)
-
-            neighbours: List[MapPos] = filter(
-                lambda pos: map.in_map(pos) and not map.is_visited(pos),
-                [(curr[0] + dx, curr[1] + dy)
-                 for dx, dy in [(-1, -1), (0, -1), (1, -1), (1, 0),
-                                 (1, 1), (0, 1), (-1, 1), (-1, 0)]]
-            )
-
-            for neighbour in neighbours:
-                tentative_gScore: float = gScore[curr] + AStar._gScore(map, curr, neighbour)
-
-                if tentative_gScore < gScore[neighbour]:
-                    path[neighbour] = curr
-                    gScore[neighbour] = tentative_gScore
-                    fScore[neighbour] = tentative_gScore + AStar._heuristicScore(map, neighbour, g)
-                    heappush(min_heap, AStarNode(neighbour, fScore[neighbour]))
-
-        print(f"{YELLOW}AStar[FINISHING]: did not find path{RESET}")
-        map.clear_visited()
+            closed[curr] = 1
+            expanded += 1
+
+            if curr == g_idx:
+                logger.debug("AStar[FINISHING]: reconstructing path after %d expansions", expanded)
+                return AStar._reconstruct(map, path, s_idx, g_idx)
+
+            cx, cy = divmod(curr, rows)
+            curr_gScore: float = gScore[curr]
+            for dx, dy, step in _NEIGHBOUR_STEPS:
+                nx: int = cx + dx
+                ny: int = cy + dy
+                # Same test as Map.in_map, inlined to skip a call and a tuple per neighbour
+                if not (0 <= nx < columns and 0 <= ny < rows):
+                    continue
+                n_idx: int = nx * rows + ny
+                if closed[n_idx]:
+                    continue
+
+                tentative_gScore: float = curr_gScore + (step + grid[nx][ny].get_cost())
+
+                if tentative_gScore < gScore[n_idx]:
+                    path[n_idx] = curr
+                    gScore[n_idx] = tentative_gScore
+                    heappush(min_heap, (tentative_gScore + h(n_idx, (nx, ny)), next(counter), n_idx))
+
+        logger.debug("AStar[FINISHING]: did not find path after %d expansions", expanded)
         return []
 
@@ -1,8 +1,26 @@
-from typing import Tuple, List
-from math import sqrt
+from typing import Tuple, List, Dict, Optional
 
 from settings import COLLISION_RADIUS
 
+COLLISION_RADIUS_SQ = COLLISION_RADIUS ** 2
+
+GridKey = Tuple[int, int]
+
+def _grid_key(pos: Tuple[float, float]) -> GridKey:
+    """
+    Get the collision grid bucket containing a position.
+
+    Buckets are COLLISION_RADIUS wide, so every object within collision
+    range of a position lies in its bucket or one of the 8 around it.
+
+    Args:
+        pos (Tuple[float, float]): Physical coordinates.
+
+    Returns:
+        GridKey: Bucket coordinates.
+    """
+    return (int(pos[0] // COLLISION_RADIUS), int(pos[1] // COLLISION_RADIUS))
+
 class WorldObject:
     """
     Basic world entity with a position.
@@ -11,6 +29,8 @@ class WorldObject:
         id (str): Unique identifier for the object.
         pos (Tuple[float, float]): Physical coordinates of the object.
     """
+    __slots__ = ("id", "pos")
+
     def __init__(self, id: str, pos: Tuple[float, float]) -> None:
         """
         Initialize a WorldObject.
@@ -37,6 +57,9 @@ class World:
 
     Attributes:
         objects (List[WorldObject]): List of objects currently in the world.
+
+    Objects are treated as static once placed: the collision grid is rebuilt
+    only when objects are added or removed.
     """
     def __init__(self, objects: List[WorldObject] = None) -> None:
         """
@@ -46,6 +69,8 @@ class World:
             objects (List[WorldObject], optional): Initial list of objects. Defaults to empty list.
         """
         self.objects = objects or []
+        self._grid: Optional[Dict[GridKey, List[WorldObject]]] = None
+        self._grid_size: int = 0
 
     def add_object(self, obj: WorldObject) -> None:
         """
@@ -55,6 +80,7 @@ class World:
             obj (WorldObject): The object to add.
         """
         self.objects.append(obj)
+        self._grid = None
 
     def remove_object(self, obj: WorldObject) -> None:
         """
@@ -65,23 +91,69 @@ class World:
         """
         if obj in self.objects:
             self.objects.remove(obj)
+            self._grid = None
+
+    def _collision_grid(self) -> Dict[GridKey, List[WorldObject]]:
+        """
+        Get the objects bucketed by collision grid cell, rebuilding it if stale.
 
-    def collides(self, id: str, pos: Tuple[float, float]) -> bool:
+        Returns:
+            Dict[GridKey, List[WorldObject]]: Objects in each occupied bucket.
+        """
+        # Objects appended straight to the list also change its length
+        if self._grid is None or self._grid_size != len(self.objects):
+            grid: Dict[GridKey, List[WorldObject]] = {}
+            for obj in self.objects:
+                grid.setdefault(_grid_key(obj.pos), []).append(obj)
+            self._grid = grid
+            self._grid_size = len(self.objects)
+        return self._grid
+
+    def collides(self, id: str, pos: Tuple[float, float]) -> List[WorldObject]:
         """
         Check if a given position collides with any other object in the world.
 
+        Only the 3x3 block of grid buckets around the position is scanned.
+
         Args:
             id (str): Identifier of the object being checked (ignored in collision with itself).
             pos (Tuple[float, float]): Position to check.
 
         Returns:
-            bool: True if collision occurs with any object (excluding itself), False otherwise.
+            List[WorldObject]: Objects (excluding itself) within collision radius; empty if none.
+        """
+        grid = self._collision_grid()
+        gx, gy = _grid_key(pos)
+        hits: List[WorldObject] = []
+        for x in (gx - 1, gx, gx + 1):
+            for y in (gy - 1, gy, gy + 1):
+                for obj in grid.get((x, y), ()):
+                    if (pos[0] - obj.pos[0]) ** 2 + (pos[1] - obj.pos[1]) ** 2 <= COLLISION_RADIUS_SQ and id != obj.id:
+                        hits.append(obj)
+        return hits
+
+    def collides_batch(self, id: str, positions: List[Tuple[float, float]]) -> List[bool]:
+        """
+        Check several positions for collisions against the same grid snapshot.
+
+        Args:
+            id (str): Identifier of the object being checked (ignored in collision with itself).
+            positions (List[Tuple[float, float]]): Positions to check.
+
+        Returns:
+            List[bool]: For each position, True if it collides with any object (excluding itself).
         """
-        return [
-            obj
-            for obj in self.objects
-            if sqrt((pos[0] - obj.pos[0]) ** 2 + (pos[1] - obj.pos[1]) ** 2) <= COLLISION_RADIUS and id != obj.id
-        ]
+        grid = self._collision_grid()
+        mask: List[bool] = []
+        for pos in positions:
+            gx, gy = _grid_key(pos)
+            mask.append(any(
+                (pos[0] - obj.pos[0]) ** 2 + (pos[1] - obj.pos[1]) ** 2 <= COLLISION_RADIUS_SQ and id != obj.id
+                for x in (gx - 1, gx, gx + 1)
+                for y in (gy - 1, gy, gy + 1)
+                for obj in grid.get((x, y), ())
+            ))
+        return mask
 
     def __repr__(self) -> str:
         """